@@ -1,5 +1,6 @@
 import os
 
+import numpy as np
 from PyQt5 import QtCore, QtWidgets
 
 from computation.torque import TorqueFile, IncompleteFile
@@ -15,12 +16,17 @@ class Simulation(QtCore.QObject):
     sigUpdateProgress = QtCore.pyqtSignal()
     sigLoaded = QtCore.pyqtSignal()
     sigUpdateLabel = QtCore.pyqtSignal(str)
+    sigTorqueAppended = QtCore.pyqtSignal(int)
+    sigTorqueReloaded = QtCore.pyqtSignal()
 
-    def __init__(self, parent, geo_file, params=None):
+    def __init__(self, parent, geo_file, params=None, dtype=np.float64):
         super(Simulation, self).__init__(parent)
 
         self._geom = None
         self.geo_file_name = geo_file
+
+        # storage precision of the torque and geometry arrays
+        self.dtype = dtype
         self.loaded = False
         self._label = None
 
@@ -34,12 +40,24 @@ class Simulation(QtCore.QObject):
         self.timer.start(4000)
         self.sigLoaded.connect(lambda: [self.timer.stop(), self.sigUpdateProgress.emit()])
 
+        # watch the torque file for time steps appended by a running solver, and its directory for the
+        # torque file being replaced (which removes it from the watcher)
+        self.torque_watcher = QtCore.QFileSystemWatcher(self)
+        self.torque_watcher.fileChanged.connect(self.refresh_torque)
+        self.torque_watcher.directoryChanged.connect(self.watch_torque_file)
+
+        # identity of the torque file read, to detect it being replaced
+        self._torque_file_id = None
+
         torque_file = os.path.join(os.path.dirname(geo_file), 'TORQUE.csv')
         if os.path.isfile(torque_file):
-            self._torque = TorqueFile(torque_file, params=params)
+            self._torque = TorqueFile(torque_file, params=params, dtype=dtype)
             try:
+                self._torque_file_id = self.torque_file_id()
                 self._torque.read()
+                self.start_watching_torque()
             except IncompleteFile:
+                self.start_watching_torque()
                 QtWidgets.QMessageBox.information(None, "Warning",
                                                   "Incomplete torque file. Only available data will be considered.",
                                                   QtWidgets.QMessageBox.Ok)
@@ -59,11 +77,69 @@ class Simulation(QtCore.QObject):
     def torque(self):
         return self._torque
 
+    def torque_file_id(self):
+        torque_stat = os.stat(self._torque.fileName)
+        return torque_stat.st_dev, torque_stat.st_ino
+
+    def start_watching_torque(self):
+        self.torque_watcher.addPath(self._torque.fileName)
+        self.torque_watcher.addPath(os.path.dirname(self._torque.fileName))
+
+    def stop_watching_torque(self):
+        paths = self.torque_watcher.files() + self.torque_watcher.directories()
+        if len(paths) > 0:
+            self.torque_watcher.removePaths(paths)
+
+    def watch_torque_file(self, directory=None):
+        # some editors and solvers replace the file, which removes it from the watcher
+        if self._torque is not None and self._torque.fileName not in self.torque_watcher.files():
+            if os.path.isfile(self._torque.fileName):
+                self.torque_watcher.addPath(self._torque.fileName)
+                self.refresh_torque()
+
+    def refresh_torque(self, file_name=None):
+        if self._torque is None or not os.path.isfile(self._torque.fileName):
+            # a replaced file is read once it exists (see watch_torque_file)
+            return
+
+        if self._torque.fileName not in self.torque_watcher.files():
+            self.torque_watcher.addPath(self._torque.fileName)
+
+        if self.torque_file_id() != self._torque_file_id:
+            self.reload_torque()
+            return
+
+        try:
+            num_time_steps = self._torque.refresh()
+        except ValueError:
+            # the file is shorter than when it was read, or its new lines do not continue it, e.g. when the
+            # solver restarts and rewrites it
+            self.reload_torque()
+            return
+
+        if num_time_steps > 0:
+            self.sigTorqueAppended.emit(num_time_steps)
+
+    def reload_torque(self):
+        # read the torque file again in full, after it is truncated or replaced
+        try:
+            self._torque_file_id = self.torque_file_id()
+            self._torque.read()
+        except IncompleteFile:
+            pass
+        except Exception as err:
+            # reported once, rather than on every change to the file
+            self.stop_watching_torque()
+            python_exception_dialog(err, None)
+            return
+
+        self.sigTorqueReloaded.emit()
+
     def geom(self):
         return self._geom
 
     def load(self):
-        self._geom = Geom(self.geo_file_name)
+        self._geom = Geom(self.geo_file_name, dtype=self.dtype)
         self._geom.load()
         self.loaded = True
         self.sigLoaded.emit()
@@ -83,6 +159,57 @@ class Simulation(QtCore.QObject):
         return self._label
 
 
+# simulations created in this process, keyed on the canonical path and identity of their geo and torque files,
+# and the inform file their parameters were read from.
+# selecting a run which is already loaded (or still loading) shares its Simulation, and so its Geom and
+# TorqueFile, rather than reading the files again.
+class SimulationRegistry:
+    def __init__(self):
+        self._simulations = dict({})
+
+    @staticmethod
+    def key(geo_file, dtype=np.float64, params=None):
+        geo_file = os.path.normcase(os.path.realpath(geo_file))
+        geo_stat = os.stat(geo_file)
+        key = (geo_file, np.dtype(dtype).name, geo_stat.st_dev, geo_stat.st_ino, geo_stat.st_size,
+               geo_stat.st_mtime_ns)
+
+        # time steps appended to the torque file are read by the simulation, so only a replaced torque
+        # file makes a different simulation
+        torque_file = os.path.join(os.path.dirname(geo_file), 'TORQUE.csv')
+        if os.path.isfile(torque_file):
+            torque_stat = os.stat(torque_file)
+            key += (torque_stat.st_dev, torque_stat.st_ino)
+
+        # the same run read with a different inform file has different parameters (e.g. steps per revolution)
+        inform_file = getattr(params, 'filename', None)
+        if inform_file is not None:
+            inform_file = os.path.normcase(os.path.realpath(inform_file))
+        key += (inform_file,)
+
+        return key
+
+    def find(self, geo_file, params=None, dtype=np.float64):
+        return self._simulations.get(self.key(geo_file, dtype, params))
+
+    def simulation(self, parent, geo_file, params=None, dtype=np.float64):
+        key = self.key(geo_file, dtype, params)
+
+        simulation = self._simulations.get(key)
+        if simulation is None:
+            simulation = Simulation(parent, geo_file, params=params, dtype=dtype)
+            self._simulations[key] = simulation
+
+        return simulation
+
+    def remove(self, simulation):
+        for key in [key for key, value in self._simulations.items() if value is simulation]:
+            del self._simulations[key]
+
+
+SimulationRegistryInstance = SimulationRegistry()
+
+
 # creates the simulation Geom object (including loading the file) in a seperate thread
 class ThreadLoader(QtCore.QThread):
     def __init__(self, parent, load_obj):
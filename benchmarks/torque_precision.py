@@ -0,0 +1,58 @@
+# Compares reading a TORQUE.csv file with float32 storage against float64 storage, reporting
+# the memory used by the per patch arrays and the drift of the mean Cp over a range of revolutions.
+#
+# usage: python -m benchmarks.torque_precision [number of time steps] [number of patches]
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.torque_read import write_torque_file
+from computation.torque import TorqueFile
+
+# largest accepted relative difference in mean Cp between float32 and float64 storage
+MAX_RELATIVE_DRIFT = 1.0e-5
+
+
+class Params:
+    StepsPerRev = 100
+    TSR = 4.0
+    Uinf = 10.0
+    R = 1.0
+    density = 1.225
+
+
+def read(file_name, dtype):
+    torque_file = TorqueFile(file_name, params=Params(), use_cache=False, dtype=dtype)
+    torque_file.read()
+
+    num_bytes = sum(getattr(torque_file, name).nbytes for name in ('torque', 'F', 'X', 'area'))
+    print('%-8s %10.1f MB' % (torque_file.dtype.name, num_bytes / 2 ** 20))
+
+    return torque_file
+
+
+def main(num_time_steps=20000, num_patches=20):
+    patches = list(range(1, num_patches + 1))
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, 'TORQUE.csv')
+        write_torque_file(file_name, num_time_steps, patches)
+
+        double = read(file_name, np.float64)
+        single = read(file_name, np.float32)
+
+        end_rev = num_time_steps // Params.StepsPerRev
+        expected, time_steps = double.cp_mean_over_range(1, end_rev, patches=tuple(patches))
+        actual, time_steps = single.cp_mean_over_range(1, end_rev, patches=tuple(patches))
+
+        drift = abs(actual - expected) / max(abs(expected), np.finfo(float).tiny)
+        print('mean Cp %.10g (float64) %.10g (float32), relative drift %.3g' % (expected, actual, drift))
+
+        if drift > MAX_RELATIVE_DRIFT:
+            raise ValueError('mean Cp drifts by more than %g with float32 storage' % MAX_RELATIVE_DRIFT)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
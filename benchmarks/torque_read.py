@@ -0,0 +1,112 @@
+# Benchmark for reading TORQUE.csv files: compares the original line by line parser
+# against TorqueFile.read_file, reporting the number of lines parsed per second.
+#
+# usage: python -m benchmarks.torque_read [number of time steps] [number of patches] [number of workers]
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from computation.torque import TorqueFile
+
+
+def write_torque_file(file_name, num_time_steps, patches):
+    rng = np.random.RandomState(0)
+
+    with open(file_name, 'w') as file:
+        file.write('%d,%d\n' % (num_time_steps, len(patches)))
+        file.write('time,omega,patch,torque,Fx,Fy,Fz,Xx,Xy,Xz,area\n')
+
+        for time_step in range(num_time_steps):
+            values = rng.uniform(-1.0, 1.0, [len(patches), 8])
+            for patch, row in zip(patches, values):
+                file.write('%.8e,%.8e,%d,%s\n' % (time_step * 1.0e-3, 2.5, patch,
+                                                  ','.join('%.8e' % v for v in row)))
+
+
+def read_file_line_by_line(torque_file):
+    # the original per line parser, kept for comparison
+    torque_file.read_patch_numbers()
+
+    with open(torque_file.fileName) as file:
+        file.readline()
+        file.readline()
+
+        max_patch_index = np.max(torque_file.patches) + 1
+        num_time_steps = torque_file.num_time_steps
+
+        torque_file.time = np.empty(num_time_steps, dtype=float)
+        torque_file.omega = np.empty(max_patch_index, dtype=float)
+        torque_file.torque = np.empty([num_time_steps, max_patch_index], dtype=float)
+        torque_file.F = np.empty([num_time_steps, max_patch_index, 3])
+        torque_file.X = np.empty([num_time_steps, max_patch_index, 3])
+        torque_file.area = np.empty([num_time_steps, max_patch_index])
+
+        for time_step in range(0, num_time_steps):
+            for iPatch in range(0, torque_file.number_patches):
+                tmp = file.readline().split(',')
+
+                torque_file.time[time_step] = float(tmp[0])
+                torque_file.omega[iPatch] = float(tmp[1])
+
+                patch_index = int(torque_file.patches[iPatch])
+
+                torque_file.torque[time_step, patch_index] = float(tmp[3])
+
+                torque_file.F[time_step, patch_index, 0] = float(tmp[4])
+                torque_file.F[time_step, patch_index, 1] = float(tmp[5])
+                torque_file.F[time_step, patch_index, 2] = float(tmp[6])
+
+                torque_file.X[time_step, patch_index, 0] = float(tmp[7])
+                torque_file.X[time_step, patch_index, 1] = float(tmp[8])
+                torque_file.X[time_step, patch_index, 2] = float(tmp[9])
+
+                torque_file.area[time_step, patch_index] = float(tmp[10])
+
+
+def time_reader(name, reader, file_name, num_lines, read_workers=1):
+    torque_file = TorqueFile(file_name, read_workers=read_workers)
+
+    start = time.perf_counter()
+    reader(torque_file)
+    elapsed = time.perf_counter() - start
+
+    print('%-14s %8.2f s %12.0f lines/s' % (name, elapsed, num_lines / elapsed))
+
+    return torque_file
+
+
+def main(num_time_steps=20000, num_patches=20, read_workers=4):
+    patches = list(range(1, num_patches + 1))
+    num_lines = num_time_steps * num_patches
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, 'TORQUE.csv')
+        write_torque_file(file_name, num_time_steps, patches)
+
+        print('%d time steps x %d patches (%d lines)' % (num_time_steps, num_patches, num_lines))
+
+        before = time_reader('line by line', read_file_line_by_line, file_name, num_lines)
+        after = time_reader('bulk', TorqueFile.read_file, file_name, num_lines)
+
+        # split the file between the workers, however small it is
+        TorqueFile.PARALLEL_READ_MIN_BYTES = 1
+        parallel = time_reader('parallel (%d)' % read_workers, TorqueFile.read_file, file_name, num_lines,
+                               read_workers=read_workers)
+
+        if not np.array_equal(before.time, after.time):
+            raise ValueError('time differs between readers')
+
+        for name in ('torque', 'F', 'X', 'area'):
+            if not np.array_equal(getattr(before, name)[:, patches], getattr(after, name)):
+                raise ValueError('%s differs between readers' % name)
+
+        for name in ('time', 'omega', 'torque'):
+            if not np.array_equal(getattr(after, name), getattr(parallel, name)):
+                raise ValueError('%s differs between serial and parallel readers' % name)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,43 @@
+import weakref
+
+import numpy as np
+
+# buffers allocated by append, and the number of values (from the start) each holds
+_buffers = weakref.WeakValueDictionary()
+_lengths = dict({})
+
+
+def append(values, new_values):
+    # values followed by new_values (along the first axis). when values are all of the values in a buffer
+    # allocated here, new_values are written to its spare capacity rather than copying values, and buffers
+    # grow geometrically, so repeatedly appending to a series is amortised O(new values). arrays returned
+    # earlier are not changed.
+    values = np.asarray(values)
+    new_values = np.asarray(new_values)
+    if len(new_values) == 0:
+        return values
+
+    length = len(values)
+    total = length + len(new_values)
+    dtype = np.result_type(values, new_values)
+
+    buffer = values.base
+    if (buffer is None or _buffers.get(id(buffer)) is not buffer or _lengths.get(id(buffer)) != length or
+            not _starts(values, buffer) or len(buffer) < total or buffer.dtype != dtype):
+        capacity = max(total, 2 * length)
+        buffer = np.empty((capacity,) + values.shape[1:], dtype=dtype)
+        buffer[:length] = values
+
+        _buffers[id(buffer)] = buffer
+        weakref.finalize(buffer, _lengths.pop, id(buffer), None)
+
+    buffer[length:total] = new_values
+    _lengths[id(buffer)] = total
+
+    return buffer[:total]
+
+
+def _starts(values, buffer):
+    # whether values is a view of buffer starting at its first value
+    return (values.__array_interface__['data'][0] == buffer.__array_interface__['data'][0] and
+            values.strides == buffer.strides)
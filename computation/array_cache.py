@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+class ArrayCache:
+    # A directory of .npy files stored beside a source file. The cache is keyed on
+    # the size, modification time and a fingerprint of the source file, so that it is
+    # only used while the source file is unchanged. Arrays are stored uncompressed,
+    # so they can be memory mapped and are only read from disk when accessed.
+
+    KEY_FILE_NAME = 'key.json'
+
+    # number of bytes at the start and end of the source file used for the fingerprint
+    FINGERPRINT_BLOCK_SIZE = 2 ** 16
+
+    def __init__(self, source_file_name, version=1, suffix='.cache'):
+        self.source_file_name = source_file_name
+        self.directory = "%s%s" % (source_file_name, suffix)
+        self.version = version
+
+    #
+    # Cache keys
+    #
+
+    def source_key(self):
+        stat = os.stat(self.source_file_name)
+
+        return dict(version=self.version,
+                    size=stat.st_size,
+                    mtime=stat.st_mtime_ns,
+                    fingerprint=self.fingerprint(stat.st_size))
+
+    def fingerprint(self, size):
+        digest = hashlib.md5()
+
+        with open(self.source_file_name, 'rb') as file:
+            digest.update(file.read(self.FINGERPRINT_BLOCK_SIZE))
+
+            if size > self.FINGERPRINT_BLOCK_SIZE:
+                file.seek(max(self.FINGERPRINT_BLOCK_SIZE, size - self.FINGERPRINT_BLOCK_SIZE))
+                digest.update(file.read(self.FINGERPRINT_BLOCK_SIZE))
+
+        return digest.hexdigest()
+
+    def cached_key(self):
+        try:
+            with open(self._key_file_name()) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def is_valid(self, key=None):
+        if key is None:
+            key = self.source_key()
+
+        return self.cached_key() == key
+
+    #
+    # Reading and writing arrays
+    #
+
+    def has(self, name):
+        return os.path.isfile(self._array_file_name(name))
+
+    def load(self, name, mmap_mode='r'):
+        return np.load(self._array_file_name(name), mmap_mode=mmap_mode)
+
+    def save(self, key, **arrays):
+        self.invalidate()
+
+        for name, array in arrays.items():
+            np.save(self._array_file_name(name), array)
+
+        self.commit(key)
+
+    def create(self, name, shape, dtype=float):
+        # create an array on disk, which can be filled incrementally before calling commit
+        os.makedirs(self.directory, exist_ok=True)
+        return np.lib.format.open_memmap(self._array_file_name(name), mode='w+', dtype=dtype, shape=shape)
+
+    def commit(self, key):
+        # the key is written last, marking the cache as complete
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._key_file_name(), 'w') as file:
+            json.dump(key, file)
+
+    def invalidate(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.isfile(self._key_file_name()):
+            os.remove(self._key_file_name())
+
+    def _array_file_name(self, name):
+        return os.path.join(self.directory, "%s.npy" % name)
+
+    def _key_file_name(self):
+        return os.path.join(self.directory, self.KEY_FILE_NAME)
@@ -0,0 +1,134 @@
+import numpy as np
+
+
+class ConvergenceMonitor:
+    # tracks the revolution to revolution change in mean Cp over a selection of patches, to find when a
+    # simulation reaches a periodic steady state. the mean Cp of each revolution is taken from the per patch
+    # cumulative torque sums of the torque file, so each newly completed revolution costs O(patches),
+    # independent of the length of the simulation.
+
+    def __init__(self, torque_file, patches, tolerance, num_revs_required=3):
+        self.torque_file = torque_file
+        self.patches = torque_file.patch_selection(patches)
+        self.columns = torque_file.patch_columns(self.patches)
+        self.steps_per_rev = int(round(torque_file.params.StepsPerRev))
+
+        # absolute change in mean Cp between consecutive revolutions which is considered converged, and
+        # the number of consecutive converged changes required
+        self.tolerance = tolerance
+        self.num_revs_required = num_revs_required
+
+        self.reset()
+
+    def reset(self):
+        # mean Cp of each complete revolution, and its change from the previous revolution
+        self._rev_cp = []
+        self._differences = []
+
+        # first revolution after the last change which exceeded the tolerance
+        self._last_violation = 0
+
+        # count, mean and sum of squared deviations of the changes since the last violation
+        self._run_count = 0
+        self._run_mean = 0.0
+        self._run_m2 = 0.0
+
+    def set_tolerance(self, tolerance):
+        self.tolerance = tolerance
+
+        # the changes are kept, so only the convergence state needs recomputing
+        differences = np.array(self._differences)
+        self._last_violation = 0
+        self._run_count = 0
+        self._run_mean = 0.0
+        self._run_m2 = 0.0
+        self._add_differences(differences, first_rev=1)
+
+    def update(self):
+        # process revolutions completed since the last update, returns the number processed
+        num_revs = self.torque_file.num_time_steps // self.steps_per_rev
+        num_processed = len(self._rev_cp)
+
+        if num_revs < num_processed:
+            # the torque file has been truncated
+            self.reset()
+            num_processed = 0
+
+        if num_revs == num_processed:
+            return 0
+
+        # cumulative torque at the end of the last processed revolution and each new revolution
+        first_rev = max(0, num_processed - 1)
+        rev_ends = np.arange(first_rev, num_revs + 1) * self.steps_per_rev
+        prefix_sum = self.torque_file.torque_prefix_sum()
+        cumulative_torque = np.sum(prefix_sum[rev_ends][:, self.columns], axis=1)
+
+        rev_cp = self.torque_file.cp(np.diff(cumulative_torque) / self.steps_per_rev)
+        if num_processed > 0:
+            # the last processed revolution is only needed for the first new change
+            differences = np.diff(rev_cp)
+            rev_cp = rev_cp[1:]
+        else:
+            differences = np.diff(rev_cp)
+
+        self._rev_cp.extend(rev_cp)
+        self._differences.extend(differences)
+        self._add_differences(differences, first_rev=len(self._differences) - len(differences) + 1)
+
+        return num_revs - num_processed
+
+    def _add_differences(self, differences, first_rev):
+        # update the convergence state with the changes of revolutions first_rev onwards
+        if len(differences) == 0:
+            return
+
+        violations = np.nonzero(np.abs(differences) > self.tolerance)[0]
+        if len(violations) > 0:
+            self._last_violation = first_rev + int(violations[-1]) + 1
+            self._run_count = 0
+            self._run_mean = 0.0
+            self._run_m2 = 0.0
+            differences = differences[violations[-1] + 1:]
+
+        if len(differences) == 0:
+            return
+
+        # combine the statistics of the new changes with those of the current run
+        count = len(differences)
+        mean = np.mean(differences)
+        m2 = np.sum((differences - mean) ** 2)
+
+        total = self._run_count + count
+        delta = mean - self._run_mean
+        self._run_mean += delta * count / total
+        self._run_m2 += m2 + delta ** 2 * self._run_count * count / total
+        self._run_count = total
+
+    #
+    # Results
+    #
+
+    def rev_cp(self):
+        # mean Cp of each complete revolution
+        return np.array(self._rev_cp)
+
+    def differences(self):
+        # change in mean Cp from the previous revolution, for each complete revolution after the first
+        return np.array(self._differences)
+
+    def converged_revolution(self):
+        # revolution (counting from 1) after which every revolution to revolution change is within the
+        # tolerance, e.g. 2 for mean Cp of 0, 10, 10, 10, ... . None if the last num_revs_required changes
+        # are not all within the tolerance
+        if self._run_count < self.num_revs_required:
+            return None
+
+        return self._last_violation
+
+    def drift(self):
+        # mean and standard deviation of the revolution to revolution change in Cp since the last
+        # change outside the tolerance, and the number of changes they are computed from
+        if self._run_count == 0:
+            return None, None, 0
+
+        return self._run_mean, np.sqrt(self._run_m2 / self._run_count), self._run_count
@@ -0,0 +1,90 @@
+import collections
+
+from computation import appendable
+
+
+class DerivedQuantities:
+    # memoized quantities derived from the data of one simulation (e.g. the total torque of a selection of
+    # patches, its Cp, and sliding window means of either), shared by every plot line showing it. Each
+    # quantity is identified by a name and its arguments, and computed by the function registered for the
+    # name. Quantities requested while computing another are recorded as its dependencies, so invalidating
+    # a quantity also invalidates every quantity derived from it. Values are stored in a ResultCache, so
+    # the memory used is bounded, and evicted values are recomputed when next requested. When data is
+    # appended (e.g. time steps read by a refresh), quantities registered with an append function are
+    # extended with values for the new data only, rather than recomputed.
+
+    def __init__(self, results):
+        self.results = results
+        # in order of registration, which is the order quantities are extended in
+        self._functions = collections.OrderedDict()
+        self._appenders = dict({})
+
+        # quantities computed from each quantity, and the quantities currently being computed
+        self._dependents = collections.defaultdict(set)
+        self._computing = []
+
+    # append(value, *args), if given, returns the values to append to value (the quantity's value before
+    # data was appended), e.g. the values for the new time steps of a per time step series. quantities
+    # must be registered after those they are computed from.
+    def register(self, name, function, append=None):
+        self._functions[name] = function
+        if append is not None:
+            self._appenders[name] = append
+
+    def get(self, name, *args):
+        key = (name,) + args
+
+        if len(self._computing) > 0:
+            self._dependents[key].add(self._computing[-1])
+
+        value = self.results.get(key)
+        if value is None:
+            self._computing.append(key)
+            try:
+                value = self._functions[name](*args)
+            finally:
+                self._computing.pop()
+
+            value = self.results.put(key, value)
+
+        return value
+
+    def invalidate(self, name, *args):
+        # discard a quantity, and every quantity derived from it
+        invalid = [(name,) + args]
+        while len(invalid) > 0:
+            key = invalid.pop()
+            self.results.pop(key)
+            invalid.extend(self._dependents.pop(key, ()))
+
+    def extend(self):
+        # brings every stored quantity up to date after data is appended. quantities without an append
+        # function are discarded, with every quantity derived from them.
+        order = dict((name, index) for index, name in enumerate(self._functions))
+
+        for key in sorted(self.results.keys(), key=lambda key: order[key[0]]):
+            value = self.results.get(key)
+            if value is None:
+                # invalidated while extending an earlier quantity
+                continue
+
+            append = self._appenders.get(key[0])
+            if append is None:
+                self.invalidate(*key)
+                continue
+
+            self._computing.append(key)
+            try:
+                new_values = append(value, *key[1:])
+            finally:
+                self._computing.pop()
+
+            if len(new_values) > 0:
+                self.results.put(key, appendable.append(value, new_values))
+
+    def clear(self):
+        self.results.clear()
+        self._dependents.clear()
+
+    def __contains__(self, key):
+        return key in self.results
@@ -1,46 +1,172 @@
 # -*- coding: utf-8 -*-
-import os
+import collections
+import itertools
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+
+from computation.array_cache import ArrayCache
+
+
+class CSRArray:
+    # variable length records of indices (e.g. the nodes of each face), stored as a single array of
+    # indices, with record i at indices[offsets[i]:offsets[i + 1]]. indexing returns the record as a view.
+    def __init__(self, offsets, indices):
+        self.offsets = offsets
+        self.indices = indices
+
+    @classmethod
+    def from_counts(cls, counts, indices):
+        offsets = np.zeros(len(counts) + 1, dtype=index_dtype(len(indices)))
+        np.cumsum(counts, out=offsets[1:])
+        max_index = np.max(indices) if len(indices) > 0 else 0
+        return cls(offsets, indices.astype(index_dtype(max_index)))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, record):
+        return self.indices[self.offsets[record]:self.offsets[record + 1]]
+
+    def counts(self):
+        return np.diff(self.offsets)
+
+    def column(self, position, records=None):
+        # index at position within each record (or each of records), which must all be long enough
+        offsets = self.offsets[:-1] if records is None else self.offsets[records]
+        return self.indices[offsets + position]
+
+    def tolist(self):
+        indices = self.indices.tolist()
+        return [indices[start:end] for start, end in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())]
+
+
+def index_dtype(max_value):
+    # int32 unless the values need more
+    return np.int32 if max_value <= np.iinfo(np.int32).max else np.int64
+
+
+def assemble_polylines(nodes_left, nodes_right):
+    # joins the faces (edges from nodes_left[i] to nodes_right[i]) into polylines, in time proportional to
+    # the number of faces. polylines run between nodes which do not join exactly two faces (ends of lines
+    # and branch points), taken in order of the faces they belong to. faces left over form closed loops,
+    # which start and end at the first node of their first face.
+    incident = collections.defaultdict(list)
+    for face, (node_left, node_right) in enumerate(zip(nodes_left, nodes_right)):
+        incident[node_left].append(face)
+        incident[node_right].append(face)
+
+    visited = [False] * len(nodes_left)
+
+    def walk(node, face):
+        line = [node]
+        while True:
+            visited[face] = True
+            node = nodes_right[face] if nodes_left[face] == node else nodes_left[face]
+            line.append(node)
+
+            faces = incident[node]
+            if len(faces) != 2:
+                return line
+
+            face = faces[1] if faces[0] == face else faces[0]
+            if visited[face]:
+                return line
+
+    lines = []
+    for face in range(len(nodes_left)):
+        for node in (nodes_left[face], nodes_right[face]):
+            if len(incident[node]) != 2:
+                for start_face in incident[node]:
+                    if not visited[start_face]:
+                        lines.append(walk(node, start_face))
+
+    for face in range(len(nodes_left)):
+        if not visited[face]:
+            lines.append(walk(nodes_left[face], face))
+
+    return lines
+
+
+class LazyArray:
+    # array of a GeoFile, which is only read from the (memory mapped) cache when first accessed
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, geo_file, owner):
+        if geo_file is None:
+            return self
+        return geo_file.load_array(self.name)
+
+    def __set__(self, geo_file, value):
+        geo_file._arrays[self.name] = value
 
 
 class GeoFile:
-    def __init__(self, file_name, message_func=print):
+    # arrays stored in the cache, connectivities are stored as CSRArray, and cached as <name>_offsets
+    # and <name>_indices. patch_faces holds the faces of each patch number, in increasing order, polylines
+    # the nodes of the outline of every patch joined into lines, and patch_polylines the polylines of
+    # each patch number.
+    CACHED_ARRAYS = ('x', 'multi_mesh_face_index', 'face2patch', 'patch2face', 'materialElem', 'elem2patch',
+                     'patch2elem', 'facePatches')
+    CONNECTIVITIES = ('face_nodes', 'elemFaces', 'adjElem', 'patch_faces', 'polylines', 'patch_polylines')
+    CACHE_VERSION = 3
+
+    x = LazyArray('x')
+    multi_mesh_face_index = LazyArray('multi_mesh_face_index')
+    face2patch = LazyArray('face2patch')
+    patch2face = LazyArray('patch2face')
+    materialElem = LazyArray('materialElem')
+    elem2patch = LazyArray('elem2patch')
+    patch2elem = LazyArray('patch2elem')
+    facePatches = LazyArray('facePatches')
+    face_nodes = LazyArray('face_nodes')
+    elemFaces = LazyArray('elemFaces')
+    adjElem = LazyArray('adjElem')
+    patch_faces = LazyArray('patch_faces')
+    polylines = LazyArray('polylines')
+    patch_polylines = LazyArray('patch_polylines')
+
+    # number of records (nodes, faces or elements) parsed per bulk read of the .geo file
+    READ_CHUNK_RECORDS = 2 ** 18
+
+    def __init__(self, file_name, message_func=print, dtype=np.float64):
         self.message_func = message_func
         self.file_name = file_name
         self.loaded = False
 
+        # storage precision of the node coordinates, of which only x and y are kept
+        self.dtype = np.dtype(dtype)
+
         # initialise progress counters
         self.progress = 0
         self.progress_total = 0
+
+        # each storage precision has its own cache, keyed on the .geo file it was read from
+        suffix = '.cache' if self.dtype == np.float64 else '.%s.cache' % self.dtype.name
+        self._cache = ArrayCache(file_name, version=self.CACHE_VERSION, suffix=suffix)
+        self._cache_key = None
         self.cached = False
 
+        # storage for the arrays (None until read, or until loaded from the cache)
+        self._arrays = dict({})
+
         # declare variables
         self.num_elements = None
-        self.face_nodes = None
-        self.multi_mesh_face_index = None
-        self.face2patch = None
-        self.patch2face = None
-        self.x = None
-        self.elemFaces = None
-        self.materialElem = None
-        self.elem2patch = None
-        self.patch2elem = None
-        self.adjElem = []
-        self.facePatches = None
 
     def load(self):
         # if already loaded, do nothin
         if self.loaded:
             return True
 
-        # if a cache file exists, load from the cache file
-        if self.load_cache_if_exists():
+        # if a cache of the current .geo file exists, load from the cache
+        if self.load_cache_if_valid():
             self.message_func('File loaded from cache...')
             return True
 
         # if needs loading, load from .geo file
+        self._cache_key = self._cache.source_key()
         with open(self.file_name) as file:
             ver, num_nodes, num_faces, self.num_elements = map(int, file.readline().split())
 
@@ -48,127 +174,240 @@ class GeoFile:
 
             self.message_func('Reading nodes...')
 
-            self.x = np.empty((num_nodes, 3))
-            for iNode in range(num_nodes):
-                tmp = file.readline().split()
-                self.x[iNode, :] = list(map(float, tmp[0:3]))
-                self.progress += 1
+            self.x = np.empty((num_nodes, 2), dtype=self.dtype)
+            for start, end in self._chunks(num_nodes):
+                lines = self._read_lines(file, end - start)
+                values = np.fromstring(''.join(lines), dtype=np.float64, sep=' ')
+                if len(values) % len(lines) != 0:
+                    # node lines of different lengths
+                    values = np.array([line.split()[:2] for line in lines], dtype=np.float64)
+                self.x[start:end] = values.reshape([len(lines), -1])[:, :2]
+                self.progress += end - start
 
             self.message_func('Reading faces...')
 
-            self.face_nodes = []
+            vertices = []
+            num_vertices_faces = np.empty(num_faces, dtype=int)
             self.multi_mesh_face_index = np.empty(num_faces, dtype=int)
             self.face2patch = np.empty(num_faces, dtype=int)
-            self.patch2face = np.empty(num_faces, dtype=int)
-
-            for iFace in range(num_faces):
-                num_vertices_face = int(file.readline())
-                tmp = file.readline().split()
-                temp_vertices = list(map(int, tmp[0:num_vertices_face]))
-                temp_vertices = [x - 1 for x in temp_vertices]
-                self.face_nodes.append(temp_vertices)
-                self.multi_mesh_face_index[iFace] = int(tmp[num_vertices_face])
-                self.face2patch[iFace] = int(tmp[num_vertices_face + 1])
-                self.patch2face[self.face2patch[iFace]] = iFace
-                self.progress += 1
+
+            for start, end in self._chunks(num_faces):
+                lines = self._read_lines(file, 2 * (end - start))
+                num_vertices_faces[start:end] = self._parse_ints(lines[0::2])
+                face_vertices, trailing = self._parse_records(lines[1::2], num_vertices_faces[start:end], 2)
+                vertices.append(face_vertices - 1)
+                self.multi_mesh_face_index[start:end] = trailing[:, 0]
+                self.face2patch[start:end] = trailing[:, 1]
+                self.progress += end - start
+
+            self.face_nodes = CSRArray.from_counts(num_vertices_faces, self._join(vertices))
+
+            self.patch2face = self._last_index_of(self.face2patch, num_faces)
 
             self.message_func('Reading elements...')
 
-            self.elemFaces = []
+            faces = []
             self.materialElem = np.empty(self.num_elements, dtype=int)
             self.elem2patch = np.empty(self.num_elements, dtype=int)
-            self.patch2elem = np.empty(self.num_elements, dtype=int)
 
             num_faces_elements = np.empty(self.num_elements, dtype=int)
-            for iElem in range(self.num_elements):
-                num_faces_element = int(file.readline())
-                tmp = file.readline().split()
-
-                elem_faces_tmp = list(map(int, tmp[0:num_faces_element]))
-                elem_faces_tmp = [x - 1 for x in elem_faces_tmp]
-                self.elemFaces.append(elem_faces_tmp)
-                self.materialElem[iElem] = int(tmp[num_faces_element])
-                self.elem2patch[iElem] = int(tmp[num_faces_element + 1])
-                self.patch2elem[self.elem2patch[iElem]] = iElem
-                num_faces_elements[iElem] = num_faces_element
-                self.progress += 1
+            for start, end in self._chunks(self.num_elements):
+                lines = self._read_lines(file, 2 * (end - start))
+                num_faces_elements[start:end] = self._parse_ints(lines[0::2])
+                element_faces, trailing = self._parse_records(lines[1::2], num_faces_elements[start:end], 2)
+                faces.append(element_faces - 1)
+                self.materialElem[start:end] = trailing[:, 0]
+                self.elem2patch[start:end] = trailing[:, 1]
+                self.progress += end - start
+
+            self.elemFaces = CSRArray.from_counts(num_faces_elements, self._join(faces))
+            self.patch2elem = self._last_index_of(self.elem2patch, self.num_elements)
 
             self.message_func('Reading adjacency...')
-            self.adjElem = []
-            for iElem in range(self.num_elements):
-                tmp = file.readline().split()
-                tmp = list(map(int, tmp[0:num_faces_elements[iElem]]))
-                tmp = [x - 1 for x in tmp]
-                self.adjElem.append(tmp)
-                self.progress += 1
+            adjacent = []
+            for start, end in self._chunks(self.num_elements):
+                lines = self._read_lines(file, end - start)
+                adjacent_elements, trailing = self._parse_records(lines, num_faces_elements[start:end], 0)
+                adjacent.append(adjacent_elements - 1)
+                self.progress += end - start
+
+            self.adjElem = CSRArray.from_counts(num_faces_elements, self._join(adjacent))
+
+            self.patch_faces = self._group_by_patch(self.face2patch)
 
             self.facePatches = np.unique(self.face2patch)
             # remove facePatch 0 (since this refers to no patch)
             self.facePatches = self.facePatches[1:]
 
+            self.message_func('Joining patch outlines...')
+            self._assemble_patch_polylines()
+
             self.loaded = True
 
+    #
+    # Bulk parsing of the .geo file
+    #
+
+    # (start, end) of each chunk of num_records records, progress is updated after each chunk
+    def _chunks(self, num_records):
+        for start in range(0, num_records, self.READ_CHUNK_RECORDS):
+            yield start, min(start + self.READ_CHUNK_RECORDS, num_records)
+
+    def _read_lines(self, file, num_lines):
+        lines = list(itertools.islice(file, num_lines))
+        if len(lines) < num_lines:
+            raise EOFError('unexpected end of file %s' % self.file_name)
+        return lines
+
+    @staticmethod
+    def _parse_ints(lines):
+        values = np.fromstring(''.join(lines), dtype=int, sep=' ')
+        if len(values) != len(lines):
+            values = np.array([int(line) for line in lines], dtype=int)
+        return values
+
+    @staticmethod
+    def _parse_records(lines, counts, num_trailing):
+        # each line holds a record of counts[i] integers followed by num_trailing integers, any further
+        # values on the line are ignored. returns the flattened records and the (lines x num_trailing)
+        # trailing values.
+        lengths = counts + num_trailing
+
+        values = np.fromstring(''.join(lines), dtype=int, sep=' ')
+        if len(values) != np.sum(lengths):
+            # some lines hold further values
+            values = np.array([value for line, length in zip(lines, lengths) for value in line.split()[:length]],
+                              dtype=int)
+
+        ends = np.cumsum(lengths)
+        trailing_index = (ends - num_trailing)[:, np.newaxis] + np.arange(num_trailing)
+
+        is_record = np.ones(len(values), dtype=bool)
+        is_record[trailing_index.ravel()] = False
+
+        return values[is_record], values[trailing_index]
+
+    @staticmethod
+    def _join(chunks):
+        if len(chunks) == 0:
+            return np.empty(0, dtype=int)
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def _group_by_patch(patches):
+        # indices sorted by patch number (a stable sort keeps each patch in increasing order), with offsets
+        # for every patch number from 0 to the largest
+        order = np.argsort(patches, kind='mergesort')
+        counts = np.bincount(patches) if len(patches) > 0 else np.zeros(0, dtype=int)
+        return CSRArray.from_counts(counts, order)
+
+    def _assemble_patch_polylines(self):
+        # outlines of every patch (other than patch 0, the faces in no patch) as polylines
+        lines = []
+        num_lines = np.zeros(len(self.patch_faces), dtype=int)
+
+        for patch in self.facePatches:
+            faces = self.faces_of_patch(patch)
+            patch_lines = assemble_polylines(self.face_nodes.column(0, faces).tolist(),
+                                             self.face_nodes.column(1, faces).tolist())
+            lines.extend(patch_lines)
+            num_lines[patch] = len(patch_lines)
+
+        nodes = [node for line in lines for node in line]
+        self.polylines = CSRArray.from_counts([len(line) for line in lines], np.array(nodes, dtype=int))
+        self.patch_polylines = CSRArray.from_counts(num_lines, np.arange(len(lines)))
+
+    @staticmethod
+    def _last_index_of(values, size):
+        # array of size, holding at each value the index of its last occurrence in values
+        unique, first_reversed = np.unique(values[::-1], return_index=True)
+        last_index = np.empty(size, dtype=int)
+        last_index[unique] = len(values) - 1 - first_reversed
+        return last_index
+
     def cache(self):
-        if self.cached:
+        if self.cached or self._cache_key is None:
             return
         self.message_func("Caching...")
-        np.savez_compressed(self.file_name,
-                            num_elements=self.num_elements,
-                            face2patch=self.face2patch,
-                            patch2face=self.patch2face,
-                            x=self.x,
-                            elemFaces=self.elemFaces,
-                            materialElem=self.materialElem,
-                            adjElem=self.adjElem,
-                            elem2patch=self.elem2patch,
-                            patch2elem=self.patch2elem,
-                            face_nodes=self.face_nodes,
-                            facePatches=self.facePatches)
-        self.cached = True
-        self.message_func("Cached")
 
-    def load_cache_if_exists(self):
-        cache_file_name = "%s.npz" % self.file_name
-
-        if not os.path.isfile(cache_file_name):
+        arrays = dict((name, getattr(self, name)) for name in self.CACHED_ARRAYS)
+        for name in self.CONNECTIVITIES:
+            arrays[name + '_offsets'] = getattr(self, name).offsets
+            arrays[name + '_indices'] = getattr(self, name).indices
+
+        try:
+            self._cache.save(self._cache_key, num_elements=self.num_elements, **arrays)
+            self.cached = True
+            self.message_func("Cached")
+        except OSError:
+            # the cache is optional, e.g. the simulation directory may be read only
+            self.cached = False
+
+    def load_cache_if_valid(self):
+        try:
+            if not self._cache.is_valid():
+                return False
+        except OSError:
             return False
-        else:
-            self.load_from_cache_file(cache_file_name)
-            return True
 
-    def load_from_cache_file(self, file_name):
-        saved = np.load(file_name)
-        self.progress_total = len(saved.keys())
-        self.progress = 0
+        self.load_from_cache()
+        return True
+
+    def load_from_cache(self):
+        # arrays are memory mapped when first accessed, so only the parts used are read from disk
+        self._arrays = dict({})
+        self.num_elements = int(self._cache.load('num_elements'))
 
-        for key in saved.keys():
-            if not key == 'adjElem':
-                # adjElem not loaded since it isn't used
-                self.__setattr__(key, saved[key])
-            self.progress += 1
+        self.progress_total = 1
+        self.progress = 1
 
         self.cached = True
         self.loaded = True
-        '''
-        typical load times:
-            num_elements  0.31
-            face_nodes  9.63
-            multi_mesh_face_index  0.11
-            face2patch  0.11
-            patch2face  0.11
-            x  0.44
-            elemFaces  3.10
-            materialElem  0.03
-            elem2patch  0.029
-            patch2elem  0.03
-            adjElem  3.09
-            facePatches  0.01
-        '''
+
+    # faces of the patch number patch, in increasing order
+    def faces_of_patch(self, patch):
+        patch_faces = self.patch_faces
+        if patch < 0 or patch >= len(patch_faces):
+            return patch_faces.indices[:0]
+        return patch_faces[patch]
+
+    # nodes of all polylines outlining the patch number patch, and the offset of each polyline into them
+    def polyline_nodes_of_patch(self, patch):
+        if patch < 0 or patch >= len(self.patch_polylines):
+            lines = []
+        else:
+            lines = self.patch_polylines[patch]
+
+        if len(lines) == 0:
+            return self.polylines.indices[:0], np.zeros(1, dtype=int)
+
+        # the polylines of a patch are consecutive
+        offsets = self.polylines.offsets[lines[0]:lines[-1] + 2]
+        return self.polylines.indices[offsets[0]:offsets[-1]], offsets - offsets[0]
+
+    # polylines (each a list of nodes) outlining the patch number patch
+    def polylines_of_patch(self, patch):
+        nodes, offsets = self.polyline_nodes_of_patch(patch)
+        nodes = nodes.tolist()
+        offsets = offsets.tolist()
+        return [nodes[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def load_array(self, name):
+        array = self._arrays.get(name)
+
+        if array is None and self.cached:
+            if name in self.CONNECTIVITIES:
+                array = CSRArray(self._cache.load(name + '_offsets'), self._cache.load(name + '_indices'))
+            else:
+                array = self._cache.load(name)
+            self._arrays[name] = array
+
+        return array
 
 
 class Geom:
-    def __init__(self, geo_file):
-        self.geo = GeoFile(geo_file)
+    def __init__(self, geo_file, dtype=np.float64):
+        self.geo = GeoFile(geo_file, dtype=dtype)
         self.patchFaceNodes = dict({})
         self.num_faces_per_patch = None
 
@@ -184,38 +423,70 @@ class Geom:
         if self.num_faces_per_patch is not None:
             return self.num_faces_per_patch
 
+        counts = self.geo.patch_faces.counts()
+
         n_faces_per_patch = dict({})
         for index in self.geo.facePatches:
-            faces = np.where(self.geo.face2patch == index)
-            if len(faces) > 0:
-                n_faces_per_patch[index] = len(faces[0])
-            else:
-                n_faces_per_patch[index] = 0
+            n_faces_per_patch[index] = int(counts[index]) if index < len(counts) else 0
 
         self.num_faces_per_patch = n_faces_per_patch
         return self.num_faces_per_patch
 
+    @staticmethod
+    def transform_coords(coords, rotation=None, polar=False):
+        # rotates (by rotation degrees) and/or converts to polar (angle, radius) an array of 2d points
+        if rotation is not None:
+            theta = np.deg2rad(rotation)
+            rot_op = np.array([[np.cos(theta), -np.sin(theta)],
+                               [np.sin(theta), np.cos(theta)]])
+            coords = coords.dot(rot_op)
+
+        if polar:
+            coords = np.column_stack([np.arctan2(coords[:, 0], coords[:, 1]),
+                                      np.sqrt(coords[:, 0] ** 2 + coords[:, 1] ** 2)])
+
+        return coords
+
+    # outline of a patch as a list of (points x 2) coordinate arrays, one per polyline, as used by
+    # LineCollection. all points of the patch are transformed at once.
+    def get_patch_segments(self, patch_index, rotation=None, polar=False):
+        self.geo.load()
+
+        if patch_index not in self.geo.facePatches:
+            raise ValueError('Face patch %d was not found' % patch_index)
+
+        nodes, offsets = self.geo.polyline_nodes_of_patch(patch_index)
+        coords = self.transform_coords(self.geo.x[nodes, :2], rotation, polar)
+
+        return np.split(coords, offsets[1:-1])
+
+    # outline of a patch as x and y arrays, with a NaN after each polyline so it plots as a single line
+    def get_patch_xy(self, patch_index, rotation=None, polar=False):
+        self.geo.load()
+
+        if patch_index not in self.geo.facePatches:
+            raise ValueError('Face patch %d was not found' % patch_index)
+
+        nodes, offsets = self.geo.polyline_nodes_of_patch(patch_index)
+        coords = self.transform_coords(self.geo.x[nodes, :2], rotation, polar)
+        coords = np.insert(coords, offsets[1:], np.nan, axis=0)
+
+        return coords[:, 0], coords[:, 1]
+
     def get_patch_lines(self, patches, color=None, label=None,
                         rotation=None, linestyle='-', linewidth=1.0):
         self.geo.load()
 
-        # plot all lines and add rotation if necessary
+        # one line collection for each patch, with rotation if necessary
         l = []
         for iPatch in patches:
-            nodes = self.getNodesPatch(iPatch)
-
-            for lineNodes in nodes:
-                x_plot = self.geo.x[lineNodes, :2]
-                if rotation:
-                    theta = np.deg2rad(rotation)
-                    rot_op = np.array([[np.cos(theta), - np.sin(theta)],
-                                      [np.sin(theta), np.cos(theta)]])
-                    x_plot = x_plot.dot(rot_op)
-                l.extend(plt.plot(x_plot[:, 0], x_plot[:, 1], color=color,
-                                  linewidth=linewidth, linestyle=linestyle))
+            segments = self.get_patch_segments(iPatch, rotation=rotation or None)
+            l.append(plt.gca().add_collection(LineCollection(segments, colors=color, linewidths=linewidth,
+                                                             linestyles=linestyle)))
 
         l[0].set_label(label)
 
+        plt.gca().autoscale_view()
         plt.axis('equal')
 
         return l
@@ -228,8 +499,6 @@ class Geom:
         x = []
         y = []
         for iPatch in patches:
-            nodes = self.get_nodes_patches_as_lines(iPatch)
-
             if not color:
                 cmap = plt.get_cmap('jet_r')
 
@@ -238,32 +507,24 @@ class Geom:
                 color = cmap(iPatch / n)
                 label = 'Patch %d' % iPatch
 
-            for lineNodes in nodes:
-                x_plot = self.geo.x[lineNodes, :2]
-                if rotation is not None:
-                    theta = np.deg2rad(rotation)
-                    rot_op = np.array([[np.cos(theta), -np.sin(theta)],
-                                      [np.sin(theta), np.cos(theta)]])
-                    x_plot = x_plot.dot(rot_op)
-
-                if polar:
-                    xtmp = np.arctan2(x_plot[:, 0], x_plot[:, 1])
-                    ytmp = np.sqrt(x_plot[:, 0] ** 2 + x_plot[:, 1] ** 2)
-                    x_plot[:, 0] = xtmp
-                    x_plot[:, 1] = ytmp
-                x.extend(x_plot[:, 0])
-                y.extend(x_plot[:, 1])
-                x.append(np.NaN)
-                y.append(np.NaN)
-                if plot:
-                    l.extend(plt.plot(x_plot[:, 0], x_plot[:, 1], color=color, linewidth=linewidth, linestyle=linestyle))
+            if plot:
+                segments = self.get_patch_segments(iPatch, rotation=rotation, polar=polar)
+                l.append(plt.gca().add_collection(LineCollection(segments, colors=color, linewidths=linewidth,
+                                                                 linestyles=linestyle)))
+            else:
+                x_patch, y_patch = self.get_patch_xy(iPatch, rotation=rotation, polar=polar)
+                x.append(x_patch)
+                y.append(y_patch)
 
         if plot:
             l[0].set_label(label)
+            plt.gca().autoscale_view()
             plt.axis('equal')
             return l
         else:
-            return x, y
+            if len(x) == 0:
+                return np.array([]), np.array([])
+            return np.concatenate(x), np.concatenate(y)
 
     def get_patch_coords(self, patch_index):
         return self.geo.x[self.get_patch_nodes(patch_index), :2]
@@ -274,18 +535,11 @@ class Geom:
         if patch_index not in self.geo.facePatches:
             raise ValueError('Face patch %d was not found' % patch_index)
 
-        node_list = []
-        plot_lines = [node_list]
-        self.patchFaceNodes[patch_index] = plot_lines
+        faces = self.geo.faces_of_patch(patch_index)
 
-        faces = np.where(self.geo.face2patch == patch_index)
-        faces = faces[0]
+        face_nodes = np.column_stack([self.geo.face_nodes.column(0, faces), self.geo.face_nodes.column(1, faces)])
 
-        face_nodes = np.empty([len(faces), 2], dtype='int')
-        for iFace in range(len(faces)):
-            face_nodes[iFace, :] = self.geo.face_nodes[faces[iFace]][0:2]
-
-        return np.array(face_nodes)
+        return face_nodes.astype('int')
 
     # gets the nodes for a given patch, returns them as coordinates points of
     # connected lines, for use with plotting software such as matplotlib
@@ -306,73 +560,19 @@ class Geom:
         if patch_index not in self.geo.facePatches:
             raise ValueError('Face patch %d was not found' % patch_index)
 
-        node_list = []
-        plot_lines = [node_list]
-        do_init = True
-        self.patchFaceNodes[patch_index] = plot_lines
-
-        faces = np.where(self.geo.face2patch == patch_index)
-        faces = faces[0]
+        if not join:
+            # each face as a separate line
+            faces = self.geo.faces_of_patch(patch_index)
+            return np.column_stack([self.geo.face_nodes.column(0, faces),
+                                    self.geo.face_nodes.column(1, faces)]).tolist()
 
-        for iFace in faces:
-            node_left = self.geo.face_nodes[iFace][0]
-            node_right = self.geo.face_nodes[iFace][1]
+        # faces are joined into lines when the .geo file is read, and kept in the cache
+        plot_lines = self.patchFaceNodes.get(patch_index)
+        if plot_lines is None:
+            plot_lines = self.geo.polylines_of_patch(patch_index)
+            self.patchFaceNodes[patch_index] = plot_lines
 
-            # join faces together on the fly if possible...
-            if do_init:
-                node_list.extend([node_left, node_right])
-                do_init = False
-            else:
-                if node_list[0] == node_left:
-                    node_list.insert(0, node_right)
-                elif node_list[-1] == node_left:
-                    node_list.append(node_right)
-                elif node_list[0] == node_right:
-                    node_list.insert(0, node_left)
-                elif node_list[-1] == node_right:
-                    node_list.append(node_left)
-                else:
-                    # if faces can't be joined on the fly, then add
-                    # a new "line" and merge lines later
-                    node_list = [node_left, node_right]
-                    self.patchFaceNodes[patch_index].append(node_list)
-
-        # sweep all faces and join lines together...
-        if join:
-            number_changed = 100
-            while number_changed > 0:
-                number_changed = 0
-
-                i = 0
-                while i < len(plot_lines):
-                    delete_lines = []
-
-                    for j in range(i + 1, len(plot_lines)):
-                        if plot_lines[i][-1] == plot_lines[j][0]:
-                            plot_lines[i].extend(plot_lines[j][1:])
-                            delete_lines.append(j)
-                        elif plot_lines[i][-1] == plot_lines[j][-1]:
-                            plot_lines[j].reverse()
-                            plot_lines[i].extend(plot_lines[j][1:])
-                            delete_lines.append(j)
-                        elif plot_lines[i][0] == plot_lines[j][0]:
-                            plot_lines[i].reverse()
-                            plot_lines[i].extend(plot_lines[j][1:])
-                            delete_lines.append(j)
-                        elif plot_lines[i][0] == plot_lines[j][-1]:
-                            plot_lines[i].reverse()
-                            plot_lines[j].reverse()
-                            plot_lines[i].extend(plot_lines[j][1:])
-                            delete_lines.append(j)
-
-                    number_changed += len(delete_lines)
-
-                    for delLine in sorted(delete_lines, reverse=True):
-                        del plot_lines[delLine]
-
-                    i += 1
-
-            return plot_lines
+        return plot_lines
 
     def blade_radius(self, blade_patches):
         self.geo.load()
@@ -381,18 +581,19 @@ class Geom:
         color = 'red'
 
         for iPatch in blade_patches:
-            faces = np.where(self.geo.face2patch == iPatch)
-            faces = faces[0]
+            faces = self.geo.faces_of_patch(iPatch)
+            if len(faces) == 0:
+                continue
 
-            for iFace in faces:
-                nodes = self.geo.face_nodes[iFace]
-                x_plot = self.geo.x[nodes, 0:2]
+            # (faces x 2 x 2) end points of every face of the patch
+            x_faces = np.stack([self.geo.x[self.geo.face_nodes.column(0, faces), 0:2],
+                                self.geo.x[self.geo.face_nodes.column(1, faces), 0:2]], axis=1)
 
-                max_face = np.sqrt(np.sum([x ** 2 for x in x_plot]))
+            max_radius = max(max_radius, np.max(np.sqrt(np.sum(x_faces ** 2, axis=(1, 2)))))
 
-                if max_face > max_radius:
-                    max_radius = max_face
+            plt.gca().add_collection(LineCollection(x_faces, colors=color, linestyles='-'))
 
-                plt.plot(x_plot[:, 0], x_plot[:, 1], '-', c=color)
+        plt.gca().autoscale_view()
+        plt.axis('equal')
 
-                plt.axis('equal')
+        return max_radius
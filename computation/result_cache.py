@@ -0,0 +1,57 @@
+import collections
+
+
+class ResultCache:
+    # least recently used cache of computed numpy arrays, bounded by the total number of bytes
+    # stored rather than the number of entries. Cached arrays are made read only, since they are
+    # shared by every caller requesting the same result.
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self._results = collections.OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def __len__(self):
+        return len(self._results)
+
+    def keys(self):
+        # least recently used first
+        return list(self._results.keys())
+
+    def get(self, key, default=None):
+        if key not in self._results:
+            return default
+
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    def put(self, key, result):
+        self.pop(key)
+
+        result.flags.writeable = False
+
+        # results larger than the whole cache are returned, but not stored
+        if result.nbytes > self.max_bytes:
+            return result
+
+        while self.num_bytes + result.nbytes > self.max_bytes:
+            self.pop(next(iter(self._results)))
+
+        self._results[key] = result
+        self.num_bytes += result.nbytes
+
+        return result
+
+    def pop(self, key):
+        result = self._results.pop(key, None)
+        if result is not None:
+            self.num_bytes -= result.nbytes
+
+        return result
+
+    def clear(self):
+        self._results.clear()
+        self.num_bytes = 0
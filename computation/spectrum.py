@@ -0,0 +1,66 @@
+import numpy as np
+
+# approximate number of bytes of windowed segments transformed at once
+SEGMENT_BLOCK_BYTES = 2 ** 24
+
+
+def hann_window(length):
+    # periodic Hann window, as used for spectral estimation
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(length) / length)
+
+
+def num_segments(num_samples, segment_length, overlap=0.5):
+    step = max(1, int(round(segment_length * (1 - overlap))))
+    if num_samples < segment_length:
+        return 0, step
+    return (num_samples - segment_length) // step + 1, step
+
+
+def segment_ffts(values, segment_length, overlap=0.5):
+    # real FFT of each overlapping, Hann windowed segment of every column of values (time along the first
+    # axis). the mean of each segment is removed before windowing. returns a (segments x frequencies x
+    # columns) complex array. the segments are views of values, transformed a block at a time.
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+
+    count, step = num_segments(len(values), segment_length, overlap)
+    if count == 0:
+        raise ValueError('%d samples is less than the segment length of %d' % (len(values), segment_length))
+
+    num_columns = values.shape[1]
+    segments = np.lib.stride_tricks.as_strided(values, shape=(count, segment_length, num_columns),
+                                               strides=(step * values.strides[0],) + values.strides)
+
+    window = hann_window(segment_length)[:, np.newaxis]
+    ffts = np.empty((count, segment_length // 2 + 1, num_columns), dtype=np.complex128)
+
+    block = max(1, SEGMENT_BLOCK_BYTES // (8 * segment_length * num_columns))
+    for first in range(0, count, block):
+        segment_block = segments[first:first + block].astype(np.float64)
+        segment_block -= np.mean(segment_block, axis=1, keepdims=True)
+        segment_block *= window
+        ffts[first:first + block] = np.fft.rfft(segment_block, axis=1)
+
+    return ffts
+
+
+def power_spectral_density(ffts, segment_length, delta_t):
+    # one sided power spectral density (Welch's method, per unit frequency) from the segment FFTs of
+    # segment_ffts, averaged over segments. the first axis of ffts is the segment.
+    window = hann_window(segment_length)
+    scale = delta_t / np.sum(window ** 2)
+
+    psd = np.mean(ffts.real ** 2 + ffts.imag ** 2, axis=0) * scale
+
+    # fold the power of negative frequencies onto positive frequencies, except zero and the Nyquist frequency
+    if segment_length % 2 == 0:
+        psd[1:-1] *= 2
+    else:
+        psd[1:] *= 2
+
+    return psd
+
+
+def frequencies(segment_length, delta_t):
+    return np.fft.rfftfreq(segment_length, d=delta_t)
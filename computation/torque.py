@@ -1,8 +1,18 @@
-import functools
+import collections
+import itertools
+import multiprocessing
+import os
+import warnings
 
 import matplotlib.pyplot as plt
 import numpy as np
 
+from computation import spectrum
+from computation.array_cache import ArrayCache
+from computation.convergence import ConvergenceMonitor
+from computation.derived_quantities import DerivedQuantities
+from computation.result_cache import ResultCache
+
 
 class IncompleteFile(EOFError):
     pass
@@ -12,33 +22,73 @@ class NoPatchesError(EOFError):
     pass
 
 
+# statistics at each phase (time step within a revolution) of the rotor, see TorqueFile.phase_statistics
+PhaseStatistics = collections.namedtuple('PhaseStatistics', ['phase', 'count', 'mean', 'std', 'min', 'max',
+                                                             'percentiles'])
+
+
+class LazyColumn:
+    # per time step array of a TorqueFile, which is only loaded when first accessed
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, torque_file, owner):
+        if torque_file is None:
+            return self
+        return torque_file.load_column(self.name)
+
+    def __set__(self, torque_file, value):
+        torque_file._columns[self.name] = value
+
+
 class TorqueFile:
+    # number of columns per line of the torque file:
+    # time, omega, patch, torque, F (x, y, z), X (x, y, z), area
+    NUM_COLUMNS = 11
+
+    # approximate number of lines parsed per bulk read of the torque file
+    READ_CHUNK_LINES = 2 ** 18
+
     #
     # Sliding window quantities
     #
 
-    # computes the total torque over all patches, averaged over time over a sliding window
-    def total_torque_mean_over_sliding_window(self, n_revs_window=1, patches=None):
+    # computes the total torque over all patches, averaged over time over a sliding window,
+    # for the windows starting at time step first_window and later
+    def total_torque_mean_over_sliding_window(self, n_revs_window=1, patches=None, first_window=0):
+        return self.total_torque_mean_over_sliding_windows((n_revs_window,), patches=patches,
+                                                           first_window=first_window)[0]
 
-        total_torque_per_time_step = self.total_torque_per_time_step(patches=patches)
+    # as total_torque_mean_over_sliding_window, for several window lengths from a single cumulative sum,
+    # returns a list of (mean torque, time step at end of window) for each window length
+    def total_torque_mean_over_sliding_windows(self, n_revs_windows, patches=None, first_window=0):
+        return self._sliding_window_means('window_mean', n_revs_windows, patches, first_window)
 
-        num_steps = int(np.round(n_revs_window * self.params.StepsPerRev))
+    def _sliding_window_means(self, quantity, n_revs_windows, patches, first_window):
+        if patches is None or len(patches) == 0:
+            raise NoPatchesError
 
-        # compute mean torque
-        mean_torque_prev_rev = []
-        for iTS in range(0, self.num_time_steps - num_steps):
-            torque = np.mean(total_torque_per_time_step[iTS:iTS + num_steps])
-            mean_torque_prev_rev.append(torque)
+        selection = self.patch_selection(patches)
 
-        mean_torque_prev_rev = np.array(mean_torque_prev_rev)
-        time_steps_end_rev = np.array([iTS + num_steps for iTS in range(0, self.num_time_steps - num_steps)])
+        means = []
+        for n_revs_window in n_revs_windows:
+            num_steps = int(np.round(n_revs_window * self.params.StepsPerRev))
+            if num_steps < 1:
+                raise ValueError('Sliding window must be at least one time step long')
 
-        return mean_torque_prev_rev, time_steps_end_rev
+            # every window length shares the cumulative sum of the selection
+            mean = self.derived.get(quantity, selection, num_steps)[first_window:]
+            window_end = first_window + num_steps + np.arange(len(mean))
+            means.append((mean, window_end))
+
+        return means
 
     # computes the total cp over all patches, averaged over time over a sliding window
-    def cp_mean_over_sliding_window(self, n_revs_window=1, plot=False, patches=None, units=None):
+    def cp_mean_over_sliding_window(self, n_revs_window=1, plot=False, patches=None, units=None, first_window=0):
 
-        torque, time_steps_end_rev = self.total_torque_mean_over_sliding_window(n_revs_window=n_revs_window, patches=patches)
+        torque, time_steps_end_rev = self.total_torque_mean_over_sliding_window(n_revs_window=n_revs_window,
+                                                                                patches=patches,
+                                                                                first_window=first_window)
         cp = self.cp(torque)
 
         if plot:
@@ -46,55 +96,66 @@ class TorqueFile:
 
         return cp, time_steps_end_rev
 
+    # as cp_mean_over_sliding_window, for several window lengths, returns a list of (cp, time step at end
+    # of window) for each window length
+    def cp_mean_over_sliding_windows(self, n_revs_windows, patches=None, first_window=0):
+        return self._sliding_window_means('cp_window_mean', n_revs_windows, patches, first_window)
+
     #
     # Quantities per time step
     #
-    @functools.lru_cache(20)
-    def total_torque_per_time_step(self, patches=None, plot=False, units=None):
+
+    def total_torque_per_time_step(self, patches=None, plot=False, units=None, first_time_step=0):
         if patches is None or len(patches) == 0:
             raise NoPatchesError
 
-        tot_torque = np.zeros(self.num_time_steps)
-
-        for iTS in range(self.num_time_steps):
-            for patch_index in patches:
-                tot_torque[iTS] = tot_torque[iTS] + self.torque[iTS, patch_index]
+        tot_torque = self.derived.get('total_torque', self.patch_selection(patches))[first_time_step:]
 
         if plot:
-            self._plot_transient_over_range(tot_torque, self.time_steps, units=units)
+            self._plot_transient_over_range(tot_torque, self.time_steps[first_time_step:], units=units)
 
         return tot_torque
 
-    def cp_per_time_step(self, patches=None, plot=False, units=None):
+    def cp_per_time_step(self, patches=None, plot=False, units=None, first_time_step=0):
+        if patches is None or len(patches) == 0:
+            raise NoPatchesError
 
-        torque = self.total_torque_per_time_step(patches=patches)
+        cp = self.derived.get('cp', self.patch_selection(patches))[first_time_step:]
 
-        cp = self.cp(torque)
+        time_steps = self.time_steps[first_time_step:]
 
         if plot:
-            self._plot_transient_over_range(cp, self.time_steps, units=units, y_label='Cp')
+            self._plot_transient_over_range(cp, time_steps, units=units, y_label='Cp')
 
-        return cp, self.time_steps
+        return cp, time_steps
 
     #
     # Mean values over ranges
     #
     def total_torque_mean_over_range(self, start_rev, end_rev, patches=None, plot=False, units=None):
-        total_torque_per_time_step = self.total_torque_per_time_step(patches=patches)
+        if patches is None or len(patches) == 0:
+            raise NoPatchesError
 
         start_ts = self.get_rev_time_step(start_rev)
         end_ts = self.get_rev_time_step(end_rev)
 
-        time_steps = self.time_steps[start_ts:end_ts]
-        total_torque_per_time_step = total_torque_per_time_step[start_ts:end_ts]
+        if end_ts <= start_ts:
+            raise ValueError('revolution range %g to %g contains no time steps' % (start_rev, end_rev))
+
+        # sum of the torque over the range, from the cumulative sums of each patch
+        columns = self.patch_columns(self.patch_selection(patches))
+        prefix_sum = self.torque_prefix_sum()
+        mean_torque = np.sum(prefix_sum[end_ts, columns] - prefix_sum[start_ts, columns]) / (end_ts - start_ts)
 
-        mean_torque = np.mean(total_torque_per_time_step)
+        time_steps = self.time_steps[[start_ts, end_ts - 1]]
 
         if plot:
-            self._plot_transient_over_range(total_torque_per_time_step, time_steps=time_steps, units=units)
+            total_torque_per_time_step = self.total_torque_per_time_step(patches=patches)[start_ts:end_ts]
+            self._plot_transient_over_range(total_torque_per_time_step, time_steps=self.time_steps[start_ts:end_ts],
+                                            units=units)
             self._plot_scalar_over_range(mean_torque, start_ts, end_ts, units=units)
 
-        return mean_torque, time_steps[[0, -1]]
+        return mean_torque, time_steps
 
     def cp_mean_over_range(self, start_rev, end_rev, patches=None, units=None, plot=False):
         mean_torque, time_steps = self.total_torque_mean_over_range(start_rev, end_rev, patches=patches)
@@ -108,6 +169,389 @@ class TorqueFile:
 
         return mean_cp, time_steps
 
+    #
+    # Periodic convergence
+    #
+
+    # monitor of the revolution to revolution change in mean Cp over patches, brought up to date with any
+    # time steps appended since it was last requested (at a cost proportional to the number of new
+    # revolutions). see ConvergenceMonitor.converged_revolution.
+    def convergence_monitor(self, patches, tolerance, num_revs_required=3):
+        if patches is None or len(patches) == 0:
+            raise NoPatchesError
+
+        key = (self.patch_selection(patches), num_revs_required)
+        monitor = self._convergence_monitors.get(key)
+
+        if monitor is None:
+            monitor = ConvergenceMonitor(self, patches, tolerance, num_revs_required=num_revs_required)
+            self._convergence_monitors[key] = monitor
+        elif monitor.tolerance != tolerance:
+            monitor.set_tolerance(tolerance)
+
+        monitor.update()
+
+        return monitor
+
+    # number of revolutions after which the change in mean Cp over patches between consecutive revolutions
+    # stays within tolerance, or None if it has not converged
+    def converged_revolution(self, patches, tolerance, num_revs_required=3):
+        return self.convergence_monitor(patches, tolerance, num_revs_required).converged_revolution()
+
+    #
+    # Phase averaged (revolution folded) statistics
+    #
+
+    # statistics of the total torque (or cp) over patches at each phase of the rotor, over the revolutions
+    # from start_rev to end_rev (by default all time steps). the series is folded into a (revolutions x
+    # steps per revolution) view, and the time steps of any partial final revolution are included in the
+    # statistics of the phases they reach. percentiles is a sequence of percentiles (0 to 100) to compute.
+    def phase_statistics(self, patches=None, start_rev=None, end_rev=None, percentiles=(5, 95), cp=False):
+        steps_per_rev = int(round(self.params.StepsPerRev))
+
+        start_ts = 0 if start_rev is None else self.get_rev_time_step(start_rev)
+        end_ts = self.num_time_steps if end_rev is None else self.get_rev_time_step(end_rev)
+
+        series = self.total_torque_per_time_step(patches=patches)[start_ts:end_ts]
+        if cp:
+            series = self.cp(series)
+
+        num_revs = len(series) // steps_per_rev
+        if num_revs == 0:
+            raise ValueError('time steps %d to %d contain less than one revolution' % (start_ts, end_ts))
+
+        folded = series[:num_revs * steps_per_rev].reshape([num_revs, steps_per_rev])
+        partial = series[num_revs * steps_per_rev:]
+        num_partial = len(partial)
+
+        count = np.full(steps_per_rev, num_revs, dtype=int)
+        count[:num_partial] += 1
+
+        total = np.sum(folded, axis=0, dtype=np.float64)
+        total[:num_partial] += partial
+        mean = total / count
+
+        squared_deviation = np.sum((folded - mean) ** 2, axis=0, dtype=np.float64)
+        squared_deviation[:num_partial] += (partial - mean[:num_partial]) ** 2
+        std = np.sqrt(squared_deviation / count)
+
+        minimum = np.min(folded, axis=0)
+        minimum[:num_partial] = np.minimum(minimum[:num_partial], partial)
+        maximum = np.max(folded, axis=0)
+        maximum[:num_partial] = np.maximum(maximum[:num_partial], partial)
+
+        percentile_values = np.percentile(folded, percentiles, axis=0).reshape([len(percentiles), steps_per_rev])
+        if num_partial > 0:
+            with_partial = np.vstack([folded[:, :num_partial], partial])
+            percentile_values[:, :num_partial] = np.percentile(with_partial, percentiles, axis=0).reshape(
+                [len(percentiles), num_partial])
+
+        # column i of the folded series is at phase (start_ts + i) % steps_per_rev
+        def phase_order(values):
+            return np.roll(values, start_ts % steps_per_rev, axis=-1)
+
+        return PhaseStatistics(phase=np.arange(steps_per_rev),
+                               count=phase_order(count),
+                               mean=phase_order(mean),
+                               std=phase_order(std),
+                               min=phase_order(minimum),
+                               max=phase_order(maximum),
+                               percentiles=collections.OrderedDict(
+                                   (percentile, phase_order(values))
+                                   for percentile, values in zip(percentiles, percentile_values)))
+
+    #
+    # Spectra
+    #
+
+    # real FFTs of the Hann windowed segments (of revs_per_segment revolutions, overlapping by half) of the
+    # torque on every patch, over the revolutions from start_rev to end_rev (by default all time steps). all
+    # patch columns are transformed together, and cached for the range, so that the spectrum of any
+    # selection of patches over the same range is only a sum over the selected columns.
+    def torque_segment_ffts(self, start_rev=None, end_rev=None, revs_per_segment=1):
+        start_ts, end_ts = self._time_step_range(start_rev, end_rev)
+        segment_length = self._segment_length(revs_per_segment)
+
+        return self.derived.get('segment_ffts', start_ts, end_ts, segment_length)
+
+    # power spectral density of the torque on each patch (columns, in the order of patches), over a
+    # revolution range. returns (psd, frequencies in Hz)
+    def patch_torque_spectra(self, start_rev=None, end_rev=None, revs_per_segment=1):
+        start_ts, end_ts = self._time_step_range(start_rev, end_rev)
+        segment_length = self._segment_length(revs_per_segment)
+
+        psd = self.derived.get('patch_spectra', start_ts, end_ts, segment_length)
+
+        return psd, self.spectrum_frequencies(revs_per_segment)
+
+    # power spectral density of the total torque (or cp) over patches, over a revolution range, by Welch's
+    # method. returns (psd, frequencies in Hz)
+    def total_torque_spectrum(self, start_rev=None, end_rev=None, patches=None, revs_per_segment=1, cp=False):
+        if patches is None or len(patches) == 0:
+            raise NoPatchesError
+
+        selection = self.patch_selection(patches)
+        start_ts, end_ts = self._time_step_range(start_rev, end_rev)
+        segment_length = self._segment_length(revs_per_segment)
+
+        psd = self.derived.get('torque_spectrum', selection, start_ts, end_ts, segment_length)
+
+        if cp:
+            # cp is proportional to torque
+            psd = psd * self.cp(1.0) ** 2
+
+        return psd, self.spectrum_frequencies(revs_per_segment)
+
+    def cp_spectrum(self, start_rev=None, end_rev=None, patches=None, revs_per_segment=1):
+        return self.total_torque_spectrum(start_rev, end_rev, patches=patches, revs_per_segment=revs_per_segment,
+                                          cp=True)
+
+    # frequencies (Hz) of the spectra with segments of revs_per_segment revolutions
+    def spectrum_frequencies(self, revs_per_segment=1):
+        return spectrum.frequencies(self._segment_length(revs_per_segment), self.delta_t())
+
+    # frequency (Hz) of rotation of the rotor, the first harmonic of the spectra
+    def rotor_frequency(self):
+        return 1 / (self.params.StepsPerRev * self.delta_t())
+
+    def _segment_length(self, revs_per_segment):
+        segment_length = int(round(revs_per_segment * self.params.StepsPerRev))
+        if segment_length < 2:
+            raise ValueError('spectrum segments of %g revolutions contain less than two time steps'
+                             % revs_per_segment)
+        return segment_length
+
+    def _time_step_range(self, start_rev, end_rev):
+        start_ts = 0 if start_rev is None else self.get_rev_time_step(start_rev)
+        end_ts = self.num_time_steps if end_rev is None else self.get_rev_time_step(end_rev)
+        return start_ts, end_ts
+
+    # cumulative sum over time steps of the torque on each patch (accumulated as float64), with a leading
+    # row of zeros, so that row i holds the sum over the first i time steps. it is extended as time steps
+    # are appended, rather than recomputed.
+    def torque_prefix_sum(self):
+        num_summed = self._num_prefix_summed
+
+        if num_summed < self.num_time_steps:
+            buffer = self._torque_prefix_sum
+            if buffer is None or len(buffer) < self.num_time_steps + 1:
+                capacity = self.num_time_steps + 1
+                if buffer is not None:
+                    capacity = max(capacity, 2 * len(buffer))
+
+                grown = np.zeros([capacity, self.number_patches], dtype=np.float64)
+                if buffer is not None:
+                    grown[:num_summed + 1] = buffer[:num_summed + 1]
+                buffer = self._torque_prefix_sum = grown
+
+            new_rows = buffer[num_summed + 1:self.num_time_steps + 1]
+            np.cumsum(self.torque[num_summed:self.num_time_steps], axis=0, dtype=np.float64, out=new_rows)
+            new_rows += buffer[num_summed]
+
+            self._num_prefix_summed = self.num_time_steps
+
+        return self._torque_prefix_sum[:self.num_time_steps + 1]
+
+    def _reset_running_sums(self):
+        # discard sums over the torque array, e.g. when it is re-read
+        self._torque_prefix_sum = None
+        self._num_prefix_summed = 0
+        self._group_torque = None
+        self._num_group_summed = 0
+        self._convergence_monitors = dict({})
+
+    #
+    # Named patch groups
+    #
+
+    # registers a named group of patches (e.g. the patches of one blade). the total torque of every group
+    # is computed together and kept for each time step, and is used by total_torque_per_time_step (and so
+    # by every per time step, sliding window and mean quantity) whenever the selected patches are a group
+    def add_patch_group(self, name, patches):
+        selection = self.patch_selection(patches)
+        if len(selection) == 0:
+            raise NoPatchesError
+
+        # check the patches are recorded in the torque file
+        self.patch_columns(selection)
+
+        self.patch_groups[name] = selection
+        self._group_torque = None
+        self._num_group_summed = 0
+        self.derived.invalidate('total_torque', selection)
+
+    def remove_patch_group(self, name):
+        selection = self.patch_groups.pop(name)
+        self._group_torque = None
+        self._num_group_summed = 0
+        self.derived.invalidate('total_torque', selection)
+
+    # total torque of the patch group name, for each time step
+    def group_torque_per_time_step(self, name, first_time_step=0):
+        group_torque = self.group_torque()[list(self.patch_groups.keys()).index(name)]
+        return group_torque[first_time_step:]
+
+    # total torque of every patch group (rows, in the order of patch_groups) for each time step, computed
+    # as a product with a (patches x groups) selection matrix. it is extended as time steps are appended.
+    def group_torque(self):
+        num_summed = self._num_group_summed
+
+        if self._group_torque is None or num_summed < self.num_time_steps:
+            buffer = self._group_torque
+            if buffer is None or buffer.shape[1] < self.num_time_steps:
+                capacity = self.num_time_steps
+                if buffer is not None:
+                    capacity = max(capacity, 2 * buffer.shape[1])
+
+                grown = np.empty([len(self.patch_groups), capacity], dtype=np.float64)
+                if buffer is not None:
+                    grown[:, :num_summed] = buffer[:, :num_summed]
+                buffer = self._group_torque = grown
+
+            selection_matrix = np.zeros([self.number_patches, len(self.patch_groups)], dtype=np.float64)
+            for group, selection in enumerate(self.patch_groups.values()):
+                selection_matrix[self.patch_columns(selection), group] = 1.0
+
+            # in chunks of time steps, to limit the memory used by float64 copies of the torque
+            chunk_steps = max(1, self.READ_CHUNK_LINES // self.number_patches)
+            for start in range(num_summed, self.num_time_steps, chunk_steps):
+                end = min(start + chunk_steps, self.num_time_steps)
+                buffer[:, start:end] = np.dot(self.torque[start:end], selection_matrix).T
+
+            self._num_group_summed = self.num_time_steps
+
+        group_torque = self._group_torque[:, :self.num_time_steps]
+        group_torque.flags.writeable = False
+
+        return group_torque
+
+    def _patch_group_of(self, selection):
+        for name, group_selection in self.patch_groups.items():
+            if group_selection == selection:
+                return name
+        return None
+
+    #
+    # Azimuth of patches
+    #
+
+    # azimuth angle (-pi to pi, clockwise from the y axis) of the centre of the patch in column, for each time
+    # step. only computed for the patches requested, and cached until time steps are appended.
+    def azimuth(self, column):
+        return self.derived.get('azimuth', column)
+
+    # index of the azimuth bin (of num_bins equal bins from -pi to pi) containing the centre of the patch
+    # in column, for each time step
+    def azimuth_bins(self, column, num_bins):
+        return self.derived.get('azimuth_bins', column, num_bins)
+
+    #
+    # Derived quantities
+    #
+
+    # each quantity is computed by its _compute_ function, and (where given) extended with the values for
+    # time steps appended by refresh by its _append_ function
+    def _register_derived_quantities(self):
+        self.derived.register('total_torque', self._compute_total_torque, self._append_total_torque)
+        self.derived.register('cp', self._compute_cp, self._append_cp)
+        self.derived.register('cumulative_torque', self._compute_cumulative_torque, self._append_cumulative_torque)
+        self.derived.register('window_mean', self._compute_window_mean, self._append_window_mean)
+        self.derived.register('cp_window_mean', self._compute_cp_window_mean, self._append_cp_window_mean)
+        self.derived.register('azimuth', self._compute_azimuth, self._append_azimuth)
+        self.derived.register('azimuth_bins', self._compute_azimuth_bins, self._append_azimuth_bins)
+
+        # spectra are of a fixed range of time steps, which appending does not change
+        self.derived.register('segment_ffts', self._compute_segment_ffts, self._append_nothing)
+        self.derived.register('patch_spectra', self._compute_patch_spectra, self._append_nothing)
+        self.derived.register('torque_spectrum', self._compute_torque_spectrum, self._append_nothing)
+
+    @staticmethod
+    def _append_nothing(value, *args):
+        return value[:0]
+
+    def _compute_total_torque(self, selection):
+        # patch groups are summed in advance
+        group = self._patch_group_of(selection)
+        if group is not None:
+            return self.group_torque_per_time_step(group)
+
+        return self._sum_patch_torque(selection, 0)
+
+    def _append_total_torque(self, total_torque, selection):
+        group = self._patch_group_of(selection)
+        if group is not None:
+            return self.group_torque_per_time_step(group, first_time_step=len(total_torque))
+
+        return self._sum_patch_torque(selection, len(total_torque))
+
+    def _sum_patch_torque(self, selection, first_time_step):
+        return np.sum(self.torque[first_time_step:, self.patch_columns(selection)], axis=1, dtype=np.float64)
+
+    def _compute_cp(self, selection):
+        return self.cp(self.derived.get('total_torque', selection))
+
+    def _append_cp(self, cp, selection):
+        return self.cp(self.derived.get('total_torque', selection)[len(cp):])
+
+    def _compute_cumulative_torque(self, selection):
+        # cumulative sum (with a leading zero) of the torque about the torque of the first time step, to
+        # limit rounding errors in long simulations. the offset does not change as time steps are appended.
+        return np.concatenate([[0.0], self._append_cumulative_torque(np.zeros(1), selection)])
+
+    def _append_cumulative_torque(self, cumulative, selection):
+        total_torque = self.derived.get('total_torque', selection)
+        return cumulative[-1] + np.cumsum(total_torque[len(cumulative) - 1:] - self._torque_offset(selection))
+
+    def _torque_offset(self, selection):
+        total_torque = self.derived.get('total_torque', selection)
+        return total_torque[0] if len(total_torque) > 0 else 0.0
+
+    def _compute_window_mean(self, selection, num_steps):
+        # mean torque over each window of num_steps time steps, ending before the last time step
+        return self._append_window_mean(np.zeros(0), selection, num_steps)
+
+    def _append_window_mean(self, window_mean, selection, num_steps):
+        cumulative = self.derived.get('cumulative_torque', selection)
+
+        first_window = len(window_mean)
+        num_windows = max(first_window, len(cumulative) - 1 - num_steps)
+        return self._torque_offset(selection) + (cumulative[first_window + num_steps:num_windows + num_steps] -
+                                                 cumulative[first_window:num_windows]) / num_steps
+
+    def _compute_cp_window_mean(self, selection, num_steps):
+        return self.cp(self.derived.get('window_mean', selection, num_steps))
+
+    def _append_cp_window_mean(self, cp_window_mean, selection, num_steps):
+        return self.cp(self.derived.get('window_mean', selection, num_steps)[len(cp_window_mean):])
+
+    def _compute_azimuth(self, column):
+        return self._append_azimuth(np.zeros(0), column)
+
+    def _append_azimuth(self, azimuth, column):
+        x = self.X[len(azimuth):, column]
+        return np.arctan2(x[:, 0], x[:, 1]).astype(self.dtype)
+
+    def _compute_azimuth_bins(self, column, num_bins):
+        return self._append_azimuth_bins(np.zeros(0), column, num_bins)
+
+    def _append_azimuth_bins(self, azimuth_bins, column, num_bins):
+        azimuth = self.derived.get('azimuth', column)[len(azimuth_bins):]
+        bins = np.floor((azimuth + np.pi) * (num_bins / (2 * np.pi)))
+        return np.clip(bins, 0, num_bins - 1).astype(np.min_scalar_type(num_bins))
+
+    def _compute_segment_ffts(self, start_ts, end_ts, segment_length):
+        return spectrum.segment_ffts(self.torque[start_ts:end_ts], segment_length)
+
+    def _compute_patch_spectra(self, start_ts, end_ts, segment_length):
+        ffts = self.derived.get('segment_ffts', start_ts, end_ts, segment_length)
+        return spectrum.power_spectral_density(ffts, segment_length, self.delta_t())
+
+    def _compute_torque_spectrum(self, selection, start_ts, end_ts, segment_length):
+        # the FFT is linear, so the FFT of the total torque is the sum of the FFTs of its patches
+        ffts = self.derived.get('segment_ffts', start_ts, end_ts, segment_length)
+        total = np.sum(ffts[:, :, self.patch_columns(selection)], axis=2)
+        return spectrum.power_spectral_density(total, segment_length, self.delta_t())
+
     #
     # Convert between time units
     #
@@ -138,15 +582,70 @@ class TorqueFile:
     #  File reading and setup
     #
 
-    def __init__(self, file_name, params=None, label=None):
+    # per time step arrays, and the column(s) of the torque file they are read from
+    COLUMNS = dict(time=0, torque=3, F=slice(4, 7), X=slice(7, 10), area=10)
+
+    # per time step arrays which are only read (from the cache or torque file) when first accessed
+    LAZY_COLUMNS = ('F', 'X', 'area')
+    F = LazyColumn('F')
+    X = LazyColumn('X')
+    area = LazyColumn('area')
+
+    # arrays stored in the binary cache beside the torque file, in addition to the lazy columns
+    CACHED_ARRAYS = ('time', 'omega', 'torque', 'patches')
+    CACHE_VERSION = 4
+
+    # maximum memory used by cached results computed from the torque data
+    RESULT_CACHE_BYTES = 2 ** 28
+
+    # when reading with more than one worker process, each worker parses at least this many bytes
+    PARALLEL_READ_MIN_BYTES = 2 ** 26
+
+    def __init__(self, file_name, params=None, label=None, use_cache=True, read_workers=1, dtype=np.float64):
         self.fileName = file_name
         self.label = label
         self.params = params
 
+        # number of processes used to parse the torque file
+        self.read_workers = read_workers
+
+        # storage precision of the per patch arrays (torque, F, X and area). time and omega are always
+        # stored as float64, and sums over patches and time steps are always accumulated as float64.
+        self.dtype = np.dtype(dtype)
+
+        # each storage precision has its own cache
+        self.use_cache = use_cache
+        self.cached = False
+        suffix = '.cache' if self.dtype == np.float64 else '.%s.cache' % self.dtype.name
+        self._cache = ArrayCache(file_name, version=self.CACHE_VERSION, suffix=suffix)
+
+        # storage for lazily loaded columns (None until loaded)
+        self._columns = dict({})
+
+        # quantities computed from the torque data, shared by every plot of the simulation, extended when
+        # time steps are appended and cleared when the file is re-read or truncated
+        self.derived = DerivedQuantities(ResultCache(self.RESULT_CACHE_BYTES))
+        self._register_derived_quantities()
+
+        # per patch cumulative sums of the torque, for the first _num_prefix_summed time steps
+        self._torque_prefix_sum = None
+        self._num_prefix_summed = 0
+
+        # convergence monitors, for each selection of patches
+        self._convergence_monitors = dict({})
+
+        # named groups of patches, and the total torque of each group for the first _num_group_summed time steps
+        self.patch_groups = collections.OrderedDict()
+        self._group_torque = None
+        self._num_group_summed = 0
+
         self.number_patches = None
         self.num_time_steps = None
         self.time_steps = None
         self.patches = None
+
+        # per patch arrays hold one column for each recorded patch, in the order of self.patches
+        self._patch_columns = dict({})
         self.time = None
         self.omega = None
         self.torque = None
@@ -154,18 +653,92 @@ class TorqueFile:
         self.X = None
         self.area = None
 
+        # per time step arrays (which the attributes above are views of), and the
+        # position in the file after the last complete time step read
+        self._buffers = dict({})
+        self._offset = 0
+
+        # lazy columns are read from the cache for the first _num_cached_steps time steps,
+        # and from the torque file (starting at _cached_offset) for any later time steps
+        self._num_cached_steps = 0
+        self._cached_offset = 0
+        self._columns_cached = False
+
     def read(self):
         try:
-            self.read_file()
+            if not self.load_cache_if_valid():
+                self.read_file_and_cache()
             self._after_file_read_hook()
         except IncompleteFile as err:
             self._after_file_read_hook()
             raise err
 
+    def read_file_and_cache(self):
+        key = self._cache.source_key()
+
+        try:
+            self.read_file(cache_columns=self.use_cache)
+        except IncompleteFile:
+            self.cache(key, complete=False)
+            raise
+
+        self.cache(key)
+
+    def cache(self, key, complete=True):
+        # the lazy columns are written to the cache while reading the file
+        if not self.use_cache or not self._columns_cached:
+            return
+
+        arrays = dict((name, getattr(self, name)) for name in self.CACHED_ARRAYS)
+
+        try:
+            self._cache.save(key, number_patches=self.number_patches, num_time_steps=self.num_time_steps,
+                             offset=self._offset, complete=complete, **arrays)
+            self.cached = True
+            self._num_cached_steps = self.num_time_steps
+            self._cached_offset = self._offset
+        except OSError:
+            # the cache is optional, e.g. the simulation directory may be read only
+            self.cached = False
+
+    def load_cache_if_valid(self):
+        if not self.use_cache:
+            return False
+
+        try:
+            if not self._cache.is_valid():
+                return False
+        except OSError:
+            return False
+
+        self.load_from_cache()
+        return True
+
+    def load_from_cache(self):
+        # torque is memory mapped, and only read from disk when accessed
+        for name in self.CACHED_ARRAYS:
+            mmap_mode = 'r' if name == 'torque' else None
+            self.__setattr__(name, self._cache.load(name, mmap_mode=mmap_mode))
+
+        self.number_patches = int(self._cache.load('number_patches'))
+        self.num_time_steps = int(self._cache.load('num_time_steps'))
+        self._set_patch_columns()
+        self._offset = int(self._cache.load('offset'))
+        self._buffers = dict((name, getattr(self, name)) for name in ('time', 'torque'))
+        self._reset_lazy_columns()
+        self._reset_running_sums()
+
+        self._num_cached_steps = self.num_time_steps
+        self._cached_offset = self._offset
+        self.cached = True
+
+        if not self._cache.load('complete'):
+            raise IncompleteFile('Torque file incomplete: %s' % self.fileName)
+
     @staticmethod
     def read_header(file):
-        tmp = file.readline().rstrip('\n')
-        tmp = tmp.split(',')
+        tmp = file.readline().rstrip(b'\r\n')
+        tmp = tmp.split(b',')
 
         number_patches = int(tmp[1])
         number_time_steps = int(tmp[0])
@@ -176,87 +749,374 @@ class TorqueFile:
         return number_patches, number_time_steps
 
     def read_patch_numbers(self):
-        with open(self.fileName) as file:
+        with open(self.fileName, 'rb') as file:
             self.number_patches, self.num_time_steps = self.read_header(file)
             self.patches = np.empty([self.number_patches], dtype=int)
 
             for iPatch in range(0, self.number_patches):
-                tmp = file.readline().split(',')
+                tmp = file.readline().split(b',')
 
                 self.patches[iPatch] = int(tmp[2])
 
-    def read_file(self):
-        time_step = 0
+        self._set_patch_columns()
+
+    def _set_patch_columns(self):
+        self._patch_columns = dict((int(patch), column) for column, patch in enumerate(self.patches))
+
+    def patch_selection(self, patches):
+        # canonical form of a selection of patches (or the name of a patch group), for use as a cache key
+        if isinstance(patches, str):
+            return self.patch_groups[patches]
+
+        return tuple(sorted(set(int(patch) for patch in patches)))
+
+    def patch_columns(self, patches):
+        # column index of each patch id in the per patch arrays
+        try:
+            return np.array([self._patch_columns[patch] for patch in patches], dtype=int)
+        except KeyError as err:
+            raise ValueError('Face patch %d was not found in torque file' % err.args[0])
+
+    def read_file(self, cache_columns=False):
+        with open(self.fileName, 'rb') as file:
+            self.read_patch_numbers()
+
+            self.number_patches, num_time_steps = self.read_header(file)
+
+            self.omega = np.empty(self.number_patches, dtype=float)
+
+            # per time step arrays are allocated with spare capacity, for time steps appended by refresh
+            self._buffers = dict((name, self._empty_column(name, num_time_steps, self.number_patches))
+                                 for name in ('time', 'torque'))
+
+            # lazy columns are not kept in memory, but may be written directly to the cache
+            self._reset_lazy_columns()
+            self._reset_running_sums()
+            self._columns_cached = False
+            if cache_columns:
+                self._buffers.update(self._create_cached_columns(num_time_steps, self.number_patches))
+
+            self._set_num_time_steps(0)
+
+            self._offset = file.tell()
+            self._num_cached_steps = 0
+            self._cached_offset = self._offset
+
+            try:
+                num_ranges = self._num_parallel_ranges(file, num_time_steps)
+                if num_ranges > 1:
+                    self._read_time_steps_parallel(file, num_time_steps, num_ranges)
+                else:
+                    self._read_time_steps(file, num_time_steps)
+            finally:
+                for name in self.LAZY_COLUMNS:
+                    if name in self._buffers:
+                        self._buffers.pop(name).flush()
+                self._reset_lazy_columns()
+
+        if self.num_time_steps < num_time_steps:
+            raise IncompleteFile('Torque file incomplete: %s' % self.fileName)
+
+    def _create_cached_columns(self, num_time_steps, number_patches):
+        try:
+            self._cache.invalidate()
+            columns = dict((name, self._cache.create(name, self._column_shape(name, num_time_steps, number_patches),
+                                                     dtype=self._column_dtype(name)))
+                           for name in self.LAZY_COLUMNS)
+            self._columns_cached = True
+            return columns
+        except OSError:
+            # the cache is optional, e.g. the simulation directory may be read only
+            return dict({})
+
+    def _empty_column(self, name, num_time_steps, number_patches):
+        return np.empty(self._column_shape(name, num_time_steps, number_patches), dtype=self._column_dtype(name))
+
+    def _column_dtype(self, name):
+        return np.dtype(np.float64) if name == 'time' else self.dtype
+
+    @staticmethod
+    def _column_shape(name, num_time_steps, number_patches):
+        if name == 'time':
+            return (num_time_steps,)
+        elif name in ('F', 'X'):
+            return (num_time_steps, number_patches, 3)
+        else:
+            return (num_time_steps, number_patches)
+
+    def refresh(self):
+        # read time steps appended to the torque file since it was last read,
+        # returns the number of new time steps
+        if os.path.getsize(self.fileName) < self._offset:
+            raise ValueError('Torque file %s is shorter than when it was read' % self.fileName)
+
+        with open(self.fileName, 'rb') as file:
+            self._offset = self._seek_next_line(file, self._offset)
+            num_time_steps = self._read_time_steps(file)
+
+        if num_time_steps > 0:
+            self.time_steps = np.arange(1, self.num_time_steps + 1)
+
+            # quantities computed from the earlier time steps are extended, rather than recomputed
+            self.derived.extend()
+
+        return num_time_steps
+
+    @staticmethod
+    def _seek_next_line(file, offset):
+        # seek to offset, skipping the line ending of the previous line (the last line read may have
+        # been complete apart from its line ending), returns the new position
+        file.seek(offset)
+        line_end = file.read(2)
+        offset += len(line_end) - len(line_end.lstrip(b'\r\n'))
+        file.seek(offset)
+
+        return offset
+
+    def _read_time_steps(self, file, max_time_steps=None):
+        # read complete time steps from the current position of file into the buffers
+        num_read = 0
+        for block, num_bytes in self._read_blocks(file, max_time_steps):
+            self._append_time_steps(block)
+            self._offset += num_bytes
+            num_read += len(block)
+
+        return num_read
+
+    def _num_parallel_ranges(self, file, num_time_steps):
+        # number of byte ranges to split the remainder of file into for parallel reading (1 to read serially)
+        if self.read_workers <= 1 or num_time_steps == 0:
+            return 1
+
+        num_bytes = os.fstat(file.fileno()).st_size - file.tell()
+        return max(1, min(self.read_workers, num_bytes // self.PARALLEL_READ_MIN_BYTES))
+
+    def _read_time_steps_parallel(self, file, num_time_steps, num_ranges):
+        # read up to num_time_steps from the current position of file into the buffers, splitting the file
+        # into byte ranges of whole time steps which are parsed by a pool of worker processes.
+        # time and torque are parsed into shared memory, lazy columns directly into the cache files.
+        shared = dict((name, (multiprocessing.RawArray('b', buffer.nbytes), buffer.dtype.str, buffer.shape))
+                      for name, buffer in self._buffers.items() if name in ('time', 'torque'))
+        cached_columns = [name for name in self.LAZY_COLUMNS if name in self._buffers]
+        for name in cached_columns:
+            self._buffers[name].flush()
+
+        byte_ranges = self._split_byte_ranges(file, num_ranges)
+
+        initargs = (self.fileName, self.patches, self._cache, shared, cached_columns)
+        with multiprocessing.Pool(min(self.read_workers, num_ranges), initializer=_init_read_worker,
+                                  initargs=initargs) as pool:
+            # count the lines in each byte range, to find the first whole time step in each
+            line_counts = pool.map(_count_lines, byte_ranges)
+            first_lines = np.cumsum([0] + line_counts[:-1])
+            first_steps = [min(-(-int(line) // self.number_patches), num_time_steps) for line in first_lines]
+            last_steps = first_steps[1:] + [num_time_steps]
+
+            tasks = [(start, first_step * self.number_patches - int(first_line), first_step, last_step - first_step)
+                     for (start, end), first_line, first_step, last_step
+                     in zip(byte_ranges, first_lines, first_steps, last_steps)]
+            results = pool.map(_read_byte_range, tasks)
+
+        for name, (buffer, dtype, shape) in shared.items():
+            self._buffers[name] = np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+        # ranges are used in order, up to the first which ends early (as the serial reader would stop there)
+        num_read = 0
+        for task, (num_range_read, offset, omega, error) in zip(tasks, results):
+            if error is not None:
+                raise error
+
+            if num_range_read > 0:
+                self._offset = offset
+                self.omega[:] = omega
+                num_read += num_range_read
+
+            if num_range_read < task[3]:
+                break
+
+        self._set_num_time_steps(num_read)
+
+        return num_read
+
+    @staticmethod
+    def _split_byte_ranges(file, num_ranges):
+        # split the remainder of file into num_ranges byte ranges, each starting at the start of a line
+        start = file.tell()
+        end = os.fstat(file.fileno()).st_size
+
+        bounds = [start]
+        for index in range(1, num_ranges):
+            file.seek(start + (end - start) * index // num_ranges - 1)
+            file.readline()
+            bounds.append(max(bounds[-1], file.tell()))
+        bounds.append(end)
+
+        file.seek(start)
+
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _read_blocks(self, file, max_time_steps=None):
+        # generates blocks of complete time steps (and their length in bytes), read from the current
+        # position of file in chunks of whole time steps, until max_time_steps are read or the end of
+        # the file is reached
+        chunk_steps = max(1, self.READ_CHUNK_LINES // self.number_patches)
+
+        num_read = 0
+        while max_time_steps is None or num_read < max_time_steps:
+            num_steps = chunk_steps
+            if max_time_steps is not None:
+                num_steps = min(num_steps, max_time_steps - num_read)
+
+            position = file.tell()
+            lines = list(itertools.islice(file, num_steps * self.number_patches))
+            block = self._parse_lines(lines)
+
+            last_line = lines[len(block) * self.number_patches - 1] if len(block) > 0 else None
+            if max_time_steps is None and last_line is not None and not last_line.endswith(b'\n'):
+                # the last line may still be being written
+                block = block[:-1]
+
+            num_read += len(block)
+
+            if len(block) < num_steps:
+                # incomplete (or no) time step at the end of the file
+                yield block, sum(len(line) for line in lines[:len(block) * self.number_patches])
+                break
+
+            yield block, file.tell() - position
+
+    def _parse_lines(self, lines):
+        # parse a list of raw lines into a (time steps, patches, columns) block,
+        # discarding any trailing lines which do not make up a complete time step
+        text = b''.join(lines).replace(b'\n', b',')
+
         try:
-            with open(self.fileName) as file:
-                self.read_patch_numbers()
+            with warnings.catch_warnings():
+                # older numpy versions only warn when a value can not be parsed
+                warnings.simplefilter('error', DeprecationWarning)
+                values = np.fromstring(text, sep=',')
+        except (ValueError, DeprecationWarning):
+            values = None
+
+        if values is None or values.size != len(lines) * self.NUM_COLUMNS:
+            # malformed tail, fall back to checking line by line
+            values = self._parse_lines_checked(lines)
 
-                max_patch_index = np.max(self.patches) + 1
+        values = values.reshape([-1, self.NUM_COLUMNS])
 
-                self.number_patches, self.num_time_steps = self.read_header(file)
+        num_steps = values.shape[0] // self.number_patches
+        block = values[:num_steps * self.number_patches].reshape([num_steps, self.number_patches, self.NUM_COLUMNS])
 
-                self.time = np.empty(self.num_time_steps, dtype=float)
-                self.omega = np.empty(max_patch_index, dtype=float)
+        if not np.all(block[:, :, 2] == self.patches):
+            raise ValueError('invalid file')
 
-                self.torque = np.empty([self.num_time_steps, max_patch_index], dtype=float)
+        return block
 
-                self.F = np.empty([self.num_time_steps, max_patch_index, 3])
+    def _parse_lines_checked(self, lines):
+        # parse lines one at a time, stopping at the first incomplete line
+        values = []
+        for line in lines:
+            tmp = line.split(b',')
 
-                self.X = np.empty([self.num_time_steps, max_patch_index, 3])
+            if len(tmp[0]) == 0 or len(tmp) < self.NUM_COLUMNS:
+                break
 
-                self.area = np.empty([self.num_time_steps, max_patch_index])
+            values.append([float(value) for value in tmp[:self.NUM_COLUMNS]])
 
-                # read torque file
-                lines = []
-                for time_step in range(0, self.num_time_steps):
-                    for iPatch in range(0, self.number_patches):
-                        line = file.readline()
-                        lines.append(line)
-                        tmp = line.split(',')
+        return np.array(values, dtype=float).reshape([-1, self.NUM_COLUMNS])
 
-                        if len(tmp[0]) == 0 or len(tmp) < 11:
-                            raise IncompleteFile('Torque file incomplete: %s' % self.fileName)
+    def _append_time_steps(self, block):
+        if len(block) == 0:
+            return
 
-                        self.time[time_step] = float(tmp[0])
-                        self.omega[iPatch] = float(tmp[1])
+        first_time_step = self.num_time_steps
+        self._reserve(first_time_step + len(block))
 
-                        patch_index = int(self.patches[iPatch])
+        self.omega[:] = block[-1, :, 1]
 
-                        if not patch_index == float(tmp[2]):
-                            raise ValueError('invalid file')
+        for name, buffer in self._buffers.items():
+            self._store_column(name, buffer, first_time_step, block)
 
-                        self.torque[time_step, patch_index] = float(tmp[3])
+        self._set_num_time_steps(first_time_step + len(block))
 
-                        self.F[time_step, patch_index, 0] = float(tmp[4])
-                        self.F[time_step, patch_index, 1] = float(tmp[5])
-                        self.F[time_step, patch_index, 2] = float(tmp[6])
+    def _store_column(self, name, column, first_time_step, block):
+        steps = slice(first_time_step, first_time_step + len(block))
 
-                        self.X[time_step, patch_index, 0] = float(tmp[7])
-                        self.X[time_step, patch_index, 1] = float(tmp[8])
-                        self.X[time_step, patch_index, 2] = float(tmp[9])
+        if name == 'time':
+            column[steps] = block[:, -1, self.COLUMNS[name]]
+        else:
+            column[steps] = block[:, :, self.COLUMNS[name]]
 
-                        self.area[time_step, patch_index] = float(tmp[10])
+    def _reserve(self, num_time_steps):
+        # grow the per time step arrays geometrically, so that appending is amortised O(1)
+        for name, buffer in self._buffers.items():
+            if num_time_steps > len(buffer):
+                capacity = max(num_time_steps, 2 * len(buffer))
+                grown = np.empty((capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+                grown[:self.num_time_steps] = buffer[:self.num_time_steps]
+                self._buffers[name] = grown
 
-        except IncompleteFile as incomplete_file_exception:
-            # remove last (possibly incomplete)
-            time_step = time_step - 1
-            self.truncate_torque_tile(time_step)
-            raise incomplete_file_exception
+    def _set_num_time_steps(self, num_time_steps):
+        self.num_time_steps = num_time_steps
 
-    def _after_file_read_hook(self):
-        self.time_steps = np.array([i + 1 for i in range(0, self.num_time_steps)])
+        for name, buffer in self._buffers.items():
+            self.__setattr__(name, buffer[:num_time_steps])
 
-    def truncate_torque_tile(self, num_time_steps):
-        self.time = self.time[1:num_time_steps]
+    #
+    # Lazily loaded columns
+    #
+
+    def load_column(self, name):
+        if self._columns.get(name) is None and self.num_time_steps is not None:
+            self._buffers[name] = self._read_column(name)
+            self._columns[name] = self._buffers[name][:self.num_time_steps]
+
+        return self._columns.get(name)
+
+    def _reset_lazy_columns(self):
+        for name in self.LAZY_COLUMNS:
+            self._buffers.pop(name, None)
+            self._columns[name] = None
+
+    def release(self):
+        # free the per time step arrays, keeping what is needed to load the lazy columns again
+        self._buffers = dict({})
+        self.time = None
+        self.torque = None
+        self._reset_lazy_columns()
+        self._reset_running_sums()
+
+    def _read_column(self, name):
+        # cached time steps are memory mapped, any later time steps are read in a single scan of the file
+        num_cached = self._num_cached_steps
 
-        self.torque = self.torque[1:num_time_steps, :]
+        if num_cached > 0:
+            cached = self._cache.load(name)[:num_cached]
+            if num_cached == self.num_time_steps:
+                return cached
 
-        self.F = self.F[1:num_time_steps, :, :]
+        column = self._empty_column(name, self.num_time_steps, self.number_patches)
+        if num_cached > 0:
+            column[:num_cached] = cached
 
-        self.X = self.X[1:num_time_steps, :, :]
+        with open(self.fileName, 'rb') as file:
+            self._seek_next_line(file, self._cached_offset)
 
-        # adjust for zero indexing
-        self.num_time_steps = num_time_steps - 1
+            time_step = num_cached
+            for block, num_bytes in self._read_blocks(file, self.num_time_steps - num_cached):
+                self._store_column(name, column, time_step, block)
+                time_step += len(block)
+
+        return column
+
+    def _after_file_read_hook(self):
+        self.time_steps = np.arange(1, self.num_time_steps + 1)
+        self.derived.clear()
+
+    def truncate_torque_tile(self, num_time_steps):
+        # discard all time steps after the first num_time_steps
+        self._set_num_time_steps(num_time_steps)
+        self._after_file_read_hook()
 
     #
     # Accessors
@@ -287,10 +1147,11 @@ class TorqueFile:
     #
 
     def draw_torque_vector(self, time_step, patch_index, scale_factor=3000, linestyle='-', color=False):
-        vector_start = self.X[time_step, patch_index, :2]
-        force = self.F[time_step, patch_index, :2]
+        column = self.patch_columns([patch_index])[0]
+        vector_start = self.X[time_step, column, :2]
+        force = self.F[time_step, column, :2]
         force_unit = force / np.sqrt(np.sum(force ** 2))
-        torque = self.torque[time_step, patch_index]
+        torque = self.torque[time_step, column]
         torque_in_force_direction = force_unit * (np.abs(torque) / scale_factor)
         vector_end = vector_start + torque_in_force_direction
 
@@ -344,37 +1205,229 @@ class TorqueFile:
 
 
 class ResumedTorqueFile(TorqueFile):
-    def __init__(self, file_names, params=None, label=None):
-        super(ResumedTorqueFile, self).__init__(file_names, params=None, label=None)
-        self.fileName = file_names[1]
-        self.label = label
-        self.params = params
-        self.read_file()
+    # torque history of a simulation which has been restarted one or more times, split over an
+    # ordered list of torque files (segments). Time steps repeated by a later segment (after
+    # restarting from an earlier checkpoint) are taken from the later segment.
 
-        time = self.time
-        omega = self.omega
-        torque = self.torque
-        force = self.F
-        x = self.X
-        area = self.area
+    def __init__(self, file_names, params=None, label=None, use_cache=True, read_workers=1, dtype=np.float64):
+        super(ResumedTorqueFile, self).__init__(file_names[-1], params=params, label=label, use_cache=False,
+                                                read_workers=read_workers, dtype=dtype)
+        self.file_names = list(file_names)
+        self.use_segment_cache = use_cache
 
-        self.fileName = file_names[0]
+        # segment torque files, and the number of time steps used from each
+        self._segments = []
 
-        self.read_file()
+    def read(self):
+        segments = []
+        incomplete = None
+
+        for file_name in self.file_names:
+            segment = TorqueFile(file_name, params=self.params, label=self.label, use_cache=self.use_segment_cache,
+                                 read_workers=self.read_workers, dtype=self.dtype)
+            try:
+                segment.read()
+                incomplete = None
+            except IncompleteFile as err:
+                # earlier segments are expected to be incomplete, as they end where the simulation was
+                # restarted, so only an incomplete last segment is reported
+                incomplete = err
+
+            if segment.cached and not isinstance(segment.torque, np.memmap):
+                # map the newly written cache, rather than keeping every segment in memory
+                try:
+                    segment.load_from_cache()
+                except IncompleteFile:
+                    pass
+
+            if len(segments) > 0 and set(segment.patches) != set(segments[0].patches):
+                raise ValueError('Torque file %s records different patches to %s' % (file_name, self.file_names[0]))
+
+            segments.append(segment)
+
+        # discard time steps at or after the start of the next segment
+        num_used = []
+        for index, segment in enumerate(segments):
+            next_starts = [s.time[0] for s in segments[index + 1:] if s.num_time_steps > 0]
+            num_time_steps = segment.num_time_steps
+            if len(next_starts) > 0 and num_time_steps > 0:
+                tolerance = 0.5 * segment.delta_t() if num_time_steps > 1 else 0
+                num_time_steps = int(np.searchsorted(segment.time, next_starts[0] - tolerance, side='left'))
+            num_used.append(num_time_steps)
+
+        # size the joined arrays once, and fill them in a single pass
+        self._init_from_segment(segments[0], sum(num_used))
+
+        self._segments = []
+        for segment, num_time_steps in zip(segments, num_used):
+            self._append_segment_steps(segment, 0, num_time_steps)
+            self._segments.append([segment, num_time_steps])
+
+            if segment is not segments[-1]:
+                # only the lazy columns of earlier segments are needed from now on
+                segment.release()
 
-        self.time = np.append(self.time, time)
-        self.omega = np.append(self.omega, omega)
+        self._after_file_read_hook()
 
-        self.torque = np.append(self.torque, torque, axis=0)
+        if incomplete is not None:
+            raise incomplete
 
-        self.F = np.append(self.F, force, axis=0)
+    @classmethod
+    def read_segment_start(cls, file_name):
+        # the number of time steps in the header, and the time of the first time step (None if there are none)
+        with open(file_name, 'rb') as file:
+            number_patches, num_time_steps = cls.read_header(file)
+            tmp = file.readline().split(b',')
 
-        self.X = np.append(self.X, x, axis=0)
+        if len(tmp) < cls.NUM_COLUMNS:
+            return num_time_steps, None
 
-        self.area = np.append(self.area, area, axis=0)
+        return num_time_steps, float(tmp[0])
 
-        self.patches = self.patches
+    def _init_from_segment(self, segment, capacity):
+        self.patches = segment.patches.copy()
+        self.number_patches = segment.number_patches
+        self._set_patch_columns()
 
-        self.nTS = len(self.time)
+        self.omega = np.empty(self.number_patches, dtype=float)
+        self._buffers = dict((name, self._empty_column(name, capacity, self.number_patches))
+                             for name in ('time', 'torque'))
+        self._reset_lazy_columns()
+        self._reset_running_sums()
+        self._set_num_time_steps(0)
 
-        self._after_file_read_hook()
+    def _append_segment_steps(self, segment, first_time_step, num_time_steps):
+        if num_time_steps == 0:
+            return
+
+        columns = segment.patch_columns(self.patches)
+        source_steps = slice(first_time_step, first_time_step + num_time_steps)
+        steps = slice(self.num_time_steps, self.num_time_steps + num_time_steps)
+
+        self._reserve(self.num_time_steps + num_time_steps)
+
+        for name, buffer in self._buffers.items():
+            if name == 'time':
+                buffer[steps] = segment.time[source_steps]
+            else:
+                buffer[steps] = getattr(segment, name)[source_steps][:, columns]
+
+        self.omega[:] = segment.omega[columns]
+        self._set_num_time_steps(self.num_time_steps + num_time_steps)
+
+    def refresh(self):
+        # only the last segment can still be growing
+        segment, num_used = self._segments[-1]
+        num_time_steps = segment.refresh()
+
+        if num_time_steps > 0:
+            self._append_segment_steps(segment, num_used, num_time_steps)
+            self._segments[-1][1] = num_used + num_time_steps
+            self.time_steps = np.arange(1, self.num_time_steps + 1)
+
+            # as for a single torque file, quantities computed from the earlier time steps are extended
+            self.derived.extend()
+
+        return num_time_steps
+
+    def _read_column(self, name):
+        column = self._empty_column(name, self.num_time_steps, self.number_patches)
+
+        time_step = 0
+        for segment, num_time_steps in self._segments:
+            columns = segment.patch_columns(self.patches)
+            column[time_step:time_step + num_time_steps] = segment.load_column(name)[:num_time_steps][:, columns]
+            time_step += num_time_steps
+
+            if segment is not self._segments[-1][0]:
+                segment.release()
+
+        return column
+
+
+def find_restart_segments(directory, file_name='TORQUE.csv'):
+    # torque files of a restarted simulation, in directory and its immediate subdirectories,
+    # ordered by the simulation time of their first time step
+    file_names = [os.path.join(directory, file_name)]
+    for sub_directory in sorted(os.listdir(directory)):
+        file_names.append(os.path.join(directory, sub_directory, file_name))
+
+    segments = []
+    for segment_file_name in file_names:
+        if os.path.isfile(segment_file_name):
+            num_time_steps, start_time = ResumedTorqueFile.read_segment_start(segment_file_name)
+            if start_time is not None:
+                segments.append((start_time, segment_file_name))
+
+    return [segment_file_name for start_time, segment_file_name in sorted(segments)]
+
+
+#
+# Parallel reading worker processes
+#
+
+_read_worker = dict({})
+
+
+def _init_read_worker(file_name, patches, cache, shared, cached_columns):
+    torque_file = TorqueFile(file_name, use_cache=False)
+    torque_file.patches = patches
+    torque_file.number_patches = len(patches)
+
+    columns = dict((name, np.frombuffer(buffer, dtype=dtype).reshape(shape))
+                   for name, (buffer, dtype, shape) in shared.items())
+
+    for name in cached_columns:
+        columns[name] = cache.load(name, mmap_mode='r+')
+
+    _read_worker.update(torque_file=torque_file, columns=columns)
+
+
+def _count_lines(byte_range):
+    start, end = byte_range
+    num_lines = 0
+
+    with open(_read_worker['torque_file'].fileName, 'rb') as file:
+        file.seek(start)
+        while start < end:
+            chunk = file.read(min(end - start, 2 ** 24))
+            if len(chunk) == 0:
+                break
+            num_lines += chunk.count(b'\n')
+            start += len(chunk)
+
+    return num_lines
+
+
+def _read_byte_range(task):
+    # parse num_time_steps whole time steps, starting num_skip lines after start, into the shared columns.
+    # returns the number of time steps read, the file position after them, the last omega and any parse error
+    start, num_skip, first_time_step, num_time_steps = task
+    torque_file = _read_worker['torque_file']
+    columns = _read_worker['columns']
+
+    num_read = 0
+    omega = None
+    with open(torque_file.fileName, 'rb') as file:
+        file.seek(start)
+        for _ in range(num_skip):
+            file.readline()
+        offset = file.tell()
+
+        try:
+            for block, num_bytes in torque_file._read_blocks(file, num_time_steps):
+                for name, column in columns.items():
+                    torque_file._store_column(name, column, first_time_step + num_read, block)
+
+                if len(block) > 0:
+                    omega = block[-1, :, 1].copy()
+                num_read += len(block)
+                offset += num_bytes
+        except ValueError as err:
+            return num_read, offset, omega, err
+
+    for column in columns.values():
+        if isinstance(column, np.memmap):
+            column.flush()
+
+    return num_read, offset, omega, None
@@ -7,7 +7,9 @@ from main_window.plot_line_bases import PlotLineModel
 from plot_types.angular_torque import PlotLineAngularTorqueView
 from plot_types.mean_values import PlotLineMeanTorqueOverRevs, PlotLineMeanCpOverRevs
 from plot_types.patches import PlotLineGeoView
+from plot_types.phase_averaged import PlotLinePhaseAveragedCp, PlotLinePhaseAveragedTorque
 from plot_types.sliding_window_plots import PlotLineCpSlidingWindowView, PlotLineTorqueSlidingWindowView
+from plot_types.spectrum import PlotLineCpSpectrum, PlotLineTorqueSpectrum
 from plot_types.transient_values import PlotLineTransientCp, PlotLineTransientMeanTorque, \
     PlotLineTransientTotalTorque
 
@@ -57,10 +59,16 @@ class WindowFactory(QtWidgets.QDialog):
                           ('Sliding Window Mean Torque', PlotLineTorqueSlidingWindowView),
                           ('Transient Total Torque', PlotLineTransientTotalTorque),
                           ('Transient Mean Torque', PlotLineTransientMeanTorque),
-                          ('Mean Torque Over Range', PlotLineMeanTorqueOverRevs)]
+                          ('Mean Torque Over Range', PlotLineMeanTorqueOverRevs),
+                          ('Phase Averaged Cp', PlotLinePhaseAveragedCp),
+                          ('Phase Averaged Torque', PlotLinePhaseAveragedTorque)]
+
+        spectrum_factories = [('Cp Spectrum', PlotLineCpSpectrum),
+                              ('Torque Spectrum', PlotLineTorqueSpectrum)]
 
         factories = [('Spatial Analysis', (geometry_factories, (MPLWidget.AxisEqual, MPLWidget.GeometryPlot))),
-                     ('Temporal Analysis', (time_factories, (MPLWidget.TimePlot,)))]
+                     ('Temporal Analysis', (time_factories, (MPLWidget.TimePlot,))),
+                     ('Spectral Analysis', (spectrum_factories, (MPLWidget.SpectrumPlot,)))]
 
         self.setLayout(QtWidgets.QVBoxLayout())
 
@@ -0,0 +1,151 @@
+import numpy as np
+
+
+class MinMaxPyramid:
+    # multi level min/max decimation of a series, built when the series is plotted and extended as points
+    # are appended to it. each level splits the series into bins (of 4, 8, 16, ... points) and keeps the
+    # indices of the smallest and largest point of each bin, so a line drawn through the kept points at about
+    # one bin per pixel shows the same peaks as the full series.
+
+    # smallest bin size, smaller bins would not reduce the number of points drawn
+    MIN_BIN_SIZE = 4
+
+    # the coarsest level has no more than this many bins
+    MAX_COARSEST_BINS = 1024
+
+    def __init__(self, y):
+        self.y = y[:0]
+        self.num_points = 0
+
+        # bin size of each level, the indices of the minimum and maximum (columns) of each bin (in a
+        # buffer with spare capacity for bins added by extend), and the number of bins
+        self.bin_sizes = []
+        self._bins = []
+        self._num_bins = []
+
+        self.extend(y)
+
+    def extend(self, y):
+        # updates the pyramid for y, the series with points appended. only the last bin of each level (which
+        # may have been partial) and the new bins are computed, so extending is amortised O(new points).
+        first_point = self.num_points
+        self.y = y
+        self.num_points = len(y)
+
+        level = 0
+        bin_size = self.MIN_BIN_SIZE
+        first_bin = first_point // bin_size
+        index_min, index_max = self._first_level(y[first_bin * bin_size:], bin_size)
+        index_min += first_bin * bin_size
+        index_max += first_bin * bin_size
+
+        while True:
+            if level == len(self._bins):
+                self.bin_sizes.append(bin_size)
+                self._bins.append(None)
+                self._num_bins.append(0)
+
+            self._store(level, first_bin, index_min, index_max)
+
+            if self._num_bins[level] <= self.MAX_COARSEST_BINS:
+                break
+
+            # bins of the next level merge pairs of bins, from the pair containing the first changed bin
+            if level + 1 < len(self._bins):
+                first_bin -= first_bin % 2
+            else:
+                first_bin = 0
+
+            bins = self._bins[level][first_bin:self._num_bins[level]]
+            index_min, index_max = self._next_level(y, bins[:, 0], bins[:, 1])
+
+            first_bin //= 2
+            bin_size *= 2
+            level += 1
+
+    def _store(self, level, first_bin, index_min, index_max):
+        # replace the bins of level from first_bin onwards
+        num_bins = first_bin + len(index_min)
+
+        buffer = self._bins[level]
+        if buffer is None or len(buffer) < num_bins:
+            capacity = num_bins if buffer is None else max(num_bins, 2 * len(buffer))
+            grown = np.empty([capacity, 2], dtype=np.min_scalar_type(capacity * self.bin_sizes[level]))
+            if buffer is not None:
+                grown[:first_bin] = buffer[:first_bin]
+            buffer = self._bins[level] = grown
+
+        buffer[first_bin:num_bins, 0] = index_min
+        buffer[first_bin:num_bins, 1] = index_max
+        self._num_bins[level] = num_bins
+
+    def _level_indices(self, level, first_bin, end_bin=None):
+        # sorted indices of the minimum and maximum of each bin of level from first_bin to end_bin (exclusive)
+        num_bins = self._num_bins[level]
+        end_bin = num_bins if end_bin is None else min(end_bin, num_bins)
+        return np.sort(self._bins[level][first_bin:end_bin], axis=1).ravel()
+
+    @staticmethod
+    def _first_level(y, bin_size):
+        num_bins, num_remaining = divmod(len(y), bin_size)
+        offsets = np.arange(num_bins) * bin_size
+
+        bins = y[:num_bins * bin_size].reshape([num_bins, bin_size])
+        index_min = offsets + np.argmin(bins, axis=1)
+        index_max = offsets + np.argmax(bins, axis=1)
+
+        if num_remaining > 0:
+            # partial final bin
+            last = num_bins * bin_size
+            index_min = np.append(index_min, last + np.argmin(y[last:]))
+            index_max = np.append(index_max, last + np.argmax(y[last:]))
+
+        return index_min, index_max
+
+    @staticmethod
+    def _next_level(y, index_min, index_max):
+        # merge pairs of bins, an unpaired final bin is kept as it is
+        num_paired = len(index_min) - len(index_min) % 2
+
+        first, second = index_min[0:num_paired:2], index_min[1:num_paired:2]
+        merged_min = np.where(y[second] < y[first], second, first)
+
+        first, second = index_max[0:num_paired:2], index_max[1:num_paired:2]
+        merged_max = np.where(y[second] > y[first], second, first)
+
+        if num_paired < len(index_min):
+            merged_min = np.append(merged_min, index_min[-1])
+            merged_max = np.append(merged_max, index_max[-1])
+
+        return merged_min, merged_max
+
+    def indices(self, start, end, num_pixels):
+        # indices of the points to draw when points start to end (exclusive) span num_pixels pixels. the
+        # points outside of this range are taken from the coarsest level, so the line still covers the
+        # full extent of the series (e.g. for autoscaling) at little cost.
+        start = min(max(0, start), self.num_points)
+        end = min(max(start, end), self.num_points)
+
+        # coarsest level with at least one bin per pixel
+        level = None
+        for candidate, bin_size in enumerate(self.bin_sizes):
+            if bin_size * num_pixels <= end - start:
+                level = candidate
+
+        if level is None:
+            bin_size = 1
+            visible = np.arange(start, end)
+        else:
+            bin_size = self.bin_sizes[level]
+            first_bin = start // bin_size
+            end_bin = (end + bin_size - 1) // bin_size
+            visible = self._level_indices(level, first_bin, end_bin)
+
+        # coarsest bins entirely before and after the visible bins
+        coarsest = len(self.bin_sizes) - 1
+        coarse_size = self.bin_sizes[-1]
+        before = self._level_indices(coarsest, 0, (start // bin_size * bin_size) // coarse_size)
+        after_start = -(-((end + bin_size - 1) // bin_size * bin_size) // coarse_size)
+        after = self._level_indices(coarsest, min(after_start, self._num_bins[coarsest]))
+
+        return np.concatenate([[0], before, visible, after, [self.num_points - 1]]).astype(int)
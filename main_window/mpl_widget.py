@@ -1,11 +1,16 @@
 import collections
 
 import matplotlib.pyplot as plt
+import numpy as np
 import qtawesome as qta
 from PyQt5 import QtWidgets, QtCore, QtGui
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 
+from computation import appendable
+from main_window.decimation import MinMaxPyramid
+
 
 class MyNavigationToolbar(NavigationToolbar):
     sigStaleLegend = QtCore.pyqtSignal()
@@ -92,6 +97,7 @@ class MPLWidget(QtWidgets.QWidget):
     AxisEqual = 1
     GeometryPlot = 2
     TimePlot = 3
+    SpectrumPlot = 4
 
     UNITS_TIME_STEPS = 1
     UNITS_SECONDS = 2
@@ -132,6 +138,13 @@ class MPLWidget(QtWidgets.QWidget):
             self.ax.set_xticks([])
             self.ax.set_yticks([])
 
+        if self.SpectrumPlot in options:
+            # power spectral densities, against frequency
+            self.units = self.UNITS_NONE
+            self.ax.set_yscale('log')
+            self.ax.set_xlabel('Frequency (Hz)')
+            self.ax.set_ylabel('Power spectral density')
+
         if self.TimePlot in options:
             self.ax.set_ylabel('Magnitude')
             self.set_time_units(self.UNITS_SECONDS)
@@ -176,13 +189,17 @@ class MPLWidget(QtWidgets.QWidget):
         if self.ax.legend_ is not None:
             self.ax.legend_.draggable(True)
 
-        self.canvas.draw()
+        # repeated redraws (e.g. while dragging a slider) are combined into a single draw
+        self.canvas.draw_idle()
 
     def new_plotter(self):
         return MPLPlotter(self)
 
 
 class MPLPlotter:
+    # lines with more points than this are drawn from a min/max decimation pyramid
+    DECIMATE_MIN_POINTS = 2 ** 15
+
     def __init__(self, mpl_widget):
         self.ax = mpl_widget.ax
         self.mpl_widget = mpl_widget
@@ -193,18 +210,30 @@ class MPLPlotter:
         self._labelled = {}
         self._plotted = {}
         self._master = None
+        self._color = None
 
         # handle changes of units
         self.convert = dict({MPLWidget.UNITS_NONE: 1})
         self.mpl_widget.sigUnitsChanged.connect(self.units_changed)
         self.units = self.mpl_widget.units
 
+        # redraw decimated lines at the resolution of the visible range
+        self.ax.callbacks.connect('xlim_changed', self.xlim_changed)
+
     def units_changed(self, units):
         self.units = units
         for handle in self._plotted:
-            x, y = handle.mydata
-            label = handle.mylabelflag
-            self.auxplot(x, y, handle, label)
+            if hasattr(handle, 'myband'):
+                self.fill_between(*handle.myband, handle=handle)
+            elif hasattr(handle, 'myvline'):
+                self.vertical_line(handle.myvline, handle=handle)
+            elif hasattr(handle, 'mysegments'):
+                # not plotted against time
+                continue
+            else:
+                x, y = handle.mydata
+                label = handle.mylabelflag
+                self.auxplot(x, y, handle, label)
 
     def set_convert(self, time_step_length, steps_per_rev):
         self.convert[MPLWidget.UNITS_SECONDS] = time_step_length
@@ -216,13 +245,49 @@ class MPLPlotter:
         self._master = self.auxplot(x, y, handle=self._master, label=True)
         self.redraw()
 
-    # auxiliary/additional plotted lines, which must be handled by caller
-    def auxplot(self, x, y, handle=None, label=False):
-        x_plot = self.convert[self.units] * x
+    # appends points to the automatically labelled plot. the points (and the decimation pyramid of a large
+    # line) are extended, rather than rebuilt.
+    def extend(self, x, y):
+        if self._master is None:
+            self.plot(x, y)
+            return
+
+        x_old, y_old = self._master.mydata
+        x = appendable.append(x_old, x)
+        y = appendable.append(y_old, y)
+        x_plot = appendable.append(self._master.myxplot, self.convert[self.units] * np.asarray(x[len(x_old):]))
+
+        pyramid = getattr(self._master, 'mypyramid', None)
+        if pyramid is not None:
+            pyramid.extend(y)
+
+        self._master = self.auxplot(x, y, handle=self._master, label=True, x_plot=x_plot)
+        self.redraw()
+
+    # number of points in the automatically labelled plot
+    def num_points(self):
+        if self._master is None:
+            return 0
+        return len(self._master.mydata[0])
+
+    # auxiliary/additional plotted lines, which must be handled by caller. x_plot, if given, is x in the
+    # current units.
+    def auxplot(self, x, y, handle=None, label=False, x_plot=None):
+        if x_plot is None:
+            x_plot = self.convert[self.units] * x
         if handle is None:
-            handle, = self.ax.plot(x_plot, y)
-        else:
+            handle, = self.ax.plot([], [])
+
+        pyramid = self._decimation_pyramid(x, y, handle)
+        handle.mypyramid = pyramid
+        handle.myxplot = x_plot
+
+        if pyramid is None:
             handle.set_data(x_plot, y)
+        else:
+            # the full range at low resolution, refined once the axis limits are known
+            indices = pyramid.indices(0, len(y), self._pixel_width())
+            handle.set_data(x_plot[indices], y[indices])
 
         handle.mydata = (x, y)
         handle.mylabelflag = label
@@ -235,8 +300,119 @@ class MPLPlotter:
         self.ax.relim()
         self.ax.autoscale_view(True, True, True)
 
+        if pyramid is not None:
+            self._decimate(handle)
+
         return handle
 
+    def _decimation_pyramid(self, x, y, handle):
+        # pyramid of a large line with increasing x, reused while the plotted y values are unchanged
+        pyramid = getattr(handle, 'mypyramid', None)
+        if pyramid is not None and pyramid.y is y:
+            return pyramid
+
+        if len(y) < self.DECIMATE_MIN_POINTS or not isinstance(y, np.ndarray) or np.any(np.diff(x) < 0):
+            return None
+
+        return MinMaxPyramid(y)
+
+    def _pixel_width(self):
+        return max(1, int(self.ax.get_window_extent().width))
+
+    def _decimate(self, handle):
+        # set the points of a decimated line for the current x limits
+        x_plot = handle.myxplot
+        y = handle.mydata[1]
+        x_min, x_max = sorted(self.ax.get_xlim())
+
+        # one point either side of the limits, so the line continues to the edges of the plot
+        start = np.searchsorted(x_plot, x_min) - 1
+        end = np.searchsorted(x_plot, x_max, side='right') + 1
+
+        indices = handle.mypyramid.indices(start, end, self._pixel_width())
+        handle.set_data(x_plot[indices], y[indices])
+
+    def xlim_changed(self, ax):
+        for handle in self._plotted:
+            if getattr(handle, 'mypyramid', None) is not None:
+                self._decimate(handle)
+
+    # shaded band between y_lower and y_upper, in the colour of the automatically labelled plot
+    def fill_between(self, x, y_lower, y_upper, handle=None, alpha=0.3):
+        x_plot = self.convert[self.units] * np.asarray(x)
+        vertices = np.concatenate([np.column_stack([x_plot, y_lower]),
+                                   np.column_stack([x_plot, y_upper])[::-1]])
+
+        if handle is None:
+            handle = PolyCollection([vertices], alpha=alpha, edgecolor='none')
+            self.ax.add_collection(handle)
+        else:
+            handle.set_verts([vertices])
+
+        if self._master is not None:
+            handle.set_facecolor(self._master.get_color())
+
+        handle.myband = (x, y_lower, y_upper)
+
+        self._process_properties(False, handle)
+
+        self.ax.relim()
+        self.ax.update_datalim(vertices)
+        self.ax.autoscale_view(True, True, True)
+
+        return handle
+
+    # vertical line across the whole plot, at x (in time steps for time plots)
+    def vertical_line(self, x, handle=None):
+        x_plot = self.convert[self.units] * x
+        if handle is None:
+            handle = self.ax.axvline(x_plot)
+        else:
+            handle.set_xdata([x_plot, x_plot])
+
+        if self._master is not None:
+            handle.set_color(self._master.get_color())
+        handle.set_linestyle('--')
+
+        handle.myvline = x
+
+        self._process_properties(False, handle)
+
+        return handle
+
+    # polylines (a list of (points x 2) arrays) drawn as a single artist in the colour of this plotter, e.g.
+    # the outline of a geometry patch. not plotted against time, so unaffected by the units.
+    def line_collection(self, segments, handle=None, label=False):
+        if handle is None:
+            handle = LineCollection(segments, colors=[self.color()])
+            self.ax.add_collection(handle, autolim=False)
+        else:
+            handle.set_segments(segments)
+
+        handle.mysegments = segments
+        handle.mylabelflag = label
+
+        self._process_properties(label, handle)
+
+        if self.mpl_widget.axis_equal:
+            self.ax.axis('equal')
+
+        if len(segments) > 0:
+            self.ax.update_datalim(np.concatenate(segments))
+        self.ax.autoscale_view(True, True, True)
+
+        return handle
+
+    # colour of the automatically labelled plot, or of this plotter's line collections
+    def color(self):
+        if self._master is not None:
+            return self._master.get_color()
+
+        if self._color is None:
+            self._color = self.ax._get_lines.get_next_color()
+
+        return self._color
+
     @staticmethod
     def _handle_set_label(label, handle):
         if label is None or not label:
@@ -25,12 +25,19 @@ class AngularTorquePlotter:
 
         self.circle_handle = None
 
-        self.bin_theta = []
-        self.bin_index = []
-
     def set_torque_file(self, torque_file):
         self.torque = torque_file
-        self.theta_bins(force=True)
+        self.plot_with_exception_handling()
+
+    def set_num_bins(self, num_bins):
+        # the azimuth of each patch is cached by the torque file, so only the binning is repeated
+        self.nSteps = num_bins
+        self.plot_with_exception_handling()
+
+    def set_num_radial_lines(self, num_radial_lines):
+        self.plotter.clear([handle for handle in self.radial_handles if handle is not None])
+        self.nRadialLines = num_radial_lines
+        self.radial_handles = [None] * (self.nRadialLines + 1)
         self.plot_with_exception_handling()
 
     def set_range(self, rev_start, rev_end):
@@ -48,20 +55,10 @@ class AngularTorquePlotter:
         except ValueError as err:
             qt_error_handling.python_exception_dialog(err, self)
 
-    def theta_bins(self, force=False):
-        if not force and len(self.bin_index) > 0:
-            return
-        if self.torque is None:
-            return
-
-        # theta value, indexed by time step and patch number
-        theta_step = np.arctan2(self.torque.X[:, :, 0], self.torque.X[:, :, 1])
-        theta_positive = theta_step + np.pi
-
-        # zero-indexed bin number for positive theta
+    def bin_theta(self):
+        # azimuth of the centre of each bin
         bin_size = 2 * np.pi / self.nSteps
-        self.bin_index = np.floor(theta_positive / bin_size)
-        self.bin_theta = (np.arange(0, self.nSteps, 1, dtype=int) + 0.5) * bin_size - np.pi
+        return (np.arange(0, self.nSteps, 1, dtype=int) + 0.5) * bin_size - np.pi
 
     def plot_circle(self):
         # add circle to plot
@@ -75,11 +72,11 @@ class AngularTorquePlotter:
         if self.torque is None or len(self.patches) == 0:
             return
 
-        self.theta_bins()
         mean_torque = self.mean_torque(self.iRevStart, self.iRevEnd)
 
         # make plots circular
-        bins = np.append(self.bin_theta, self.bin_theta[0])
+        bin_theta = self.bin_theta()
+        bins = np.append(bin_theta, bin_theta[0])
         mean_torque = np.append(mean_torque, mean_torque[0])
 
         if np.any(np.isnan(mean_torque)):
@@ -135,19 +132,21 @@ class AngularTorquePlotter:
         start_ts = round(self.torque.params.StepsPerRev * start_rev)
         end_ts = round(self.torque.params.StepsPerRev * end_rev)
 
-        torque = self.torque.torque
+        columns = self.torque.patch_columns(self.patches)
 
-        bi_tmp = self.bin_index[start_ts:end_ts, self.patches]
-        t_tmp = torque[start_ts:end_ts, self.patches]
+        # bin index and torque of every selected patch and time step in the range, binned in a single pass
+        bin_index = np.concatenate([self.torque.azimuth_bins(column, self.nSteps)[start_ts:end_ts]
+                                    for column in columns])
+        torque = self.torque.torque[start_ts:end_ts, columns].T.ravel()
 
         # check number of contributions
-        num_contributions = [np.sum(np.where(bi_tmp == i, [1], [0])) for i in range(0, self.nSteps)]
+        num_contributions = np.bincount(bin_index, minlength=self.nSteps)
 
         if np.min(num_contributions) == 0:
             raise ValueError("Some bins have zero values. Raise time range or reduce number of bins")
 
-        # compute mean torque in each bin (extending to be circular)
-        tot_torque = np.array([np.sum(np.where(bi_tmp == i, t_tmp, [0])) for i in range(0, self.nSteps)])
+        # compute mean torque in each bin
+        tot_torque = np.bincount(bin_index, weights=torque, minlength=self.nSteps)
 
         return tot_torque / num_contributions
 
@@ -168,11 +167,22 @@ class PlotLineAngularTorqueView(PlotLineView):
 
         sim_select = interface_build.simulation_selector(self, torque_connect=(patch_select.set_torque,
                                                                                self.torque_plotter.set_torque_file,
-                                                                               revs.set_max_from_torque_revs))
+                                                                               revs.set_max_from_torque_revs),
+                                                         torque_appended_connect=revs.update_max_from_torque_revs,
+                                                         torque_reloaded_connect=revs.update_max_from_torque_revs)
+
+        num_bins = interface_build.integer_selector(self, 'Number of Bins', self.torque_plotter.nSteps, 1, 3600,
+                                                    value_connect=self.torque_plotter.set_num_bins)
+
+        num_radial_lines = interface_build.integer_selector(self, 'Number of Radial Lines',
+                                                            self.torque_plotter.nRadialLines, 0, 360,
+                                                            value_connect=self.torque_plotter.set_num_radial_lines)
 
         self.layout().addWidget(sim_select)
         self.layout().addWidget(patch_select)
         self.layout().addWidget(revs)
+        self.layout().addWidget(num_bins)
+        self.layout().addWidget(num_radial_lines)
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,44 @@
+import qt_error_handling
+from sidebar_selectors import interface_build
+
+
+class ConvergenceMarker:
+    # draws a vertical line at the time step after which the simulation is periodically converged,
+    # for plots against time. The convergence state is updated incrementally as time steps are appended.
+    DEFAULT_TOLERANCE = 0.01
+
+    def __init__(self, view):
+        self.view = view
+        self.enabled = False
+        self.tolerance = self.DEFAULT_TOLERANCE
+        self.handle = None
+
+        self.selector = interface_build.convergence_selector(view, self.tolerance,
+                                                             convergence_connect=self.set_convergence)
+
+    def set_convergence(self, enabled, tolerance):
+        self.enabled = enabled
+        self.tolerance = tolerance
+        self.update()
+
+    def update(self):
+        torque = self.view.torque
+        revolution = None
+
+        if self.enabled and torque is not None and len(self.view.patches) > 0:
+            try:
+                revolution = torque.converged_revolution(self.view.patches, self.tolerance)
+            except Exception as err:
+                qt_error_handling.python_exception_dialog(err, self.view)
+
+        plotter = self.view.plotter
+        if revolution is None:
+            if self.handle is not None:
+                plotter.clear(self.handle)
+                self.handle = None
+        else:
+            # mark the last time step of the converged revolution
+            index = max(0, int(revolution * torque.params.StepsPerRev) - 1)
+            time_step = torque.time_steps[min(index, torque.num_time_steps - 1)]
+            self.handle = plotter.vertical_line(time_step, handle=self.handle)
+            plotter.redraw()
@@ -21,7 +21,9 @@ class PlotLineMeanValuesView(PlotLineView):
 
         sim_select = interface_build.simulation_selector(self, torque_connect=(self.set_torque_file,
                                                                                face_patch.set_torque,
-                                                                               revs.set_max_from_torque_revs))
+                                                                               revs.set_max_from_torque_revs),
+                                                         torque_appended_connect=revs.update_max_from_torque_revs,
+                                                         torque_reloaded_connect=revs.update_max_from_torque_revs)
 
         self.mean_value_display = QtWidgets.QLabel(self)
         self.mean_value_display.setText("")
@@ -9,6 +9,9 @@ class PlotLineGeoView(PlotLineView):
 
         self.simulation = None
 
+        # line collection of each plotted patch, kept while the patch remains selected
+        self.patch_handles = dict({})
+
         # build interface components
         patch_select = interface_build.face_patch_selector(self, patches_connect=self.plot)
 
@@ -20,17 +23,34 @@ class PlotLineGeoView(PlotLineView):
 
     def set_simulation(self, simulation):
         self.simulation = simulation
+        self.remove_patches(list(self.patch_handles.keys()))
+
+    def remove_patches(self, patches):
+        handles = [self.patch_handles.pop(patch) for patch in patches]
+        if len(handles) > 0:
+            self.plotter.clear(handles)
 
     def plot(self, patches):
+        self.remove_patches([patch for patch in self.patch_handles if patch not in patches])
+
         if self.simulation is not None:
             geom = self.simulation.geom()
             if geom is not None:
                 try:
-                    x, y = geom.get_patch_faces(patches)
-                    self.plotter.plot(x, y)
+                    # only the first patch is labelled, patches already plotted are reused
+                    for index, patch in enumerate(sorted(patches)):
+                        label = index == 0
+                        handle = self.patch_handles.get(patch)
+                        if handle is None:
+                            handle = self.plotter.line_collection(geom.get_patch_segments(patch), label=label)
+                        elif label != handle.mylabelflag:
+                            handle = self.plotter.line_collection(handle.mysegments, handle, label=label)
+                        self.patch_handles[patch] = handle
                 except ValueError as err:
                     qt_error_handling.python_exception_dialog(err, self)
 
+        self.plotter.redraw()
+
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,118 @@
+from PyQt5 import QtWidgets
+
+import qt_error_handling
+from computation.torque import NoPatchesError
+from main_window.plot_line_bases import PlotLineView
+from sidebar_selectors import interface_build
+
+
+class PlotLinePhaseAveragedView(PlotLineView):
+    # shaded bands which can be drawn around the phase averaged mean
+    BAND_STD = 'Mean +/- standard deviation'
+    BAND_MIN_MAX = 'Minimum to maximum'
+    BAND_PERCENTILES = '5th to 95th percentile'
+    BAND_NONE = 'None'
+
+    bands = (BAND_STD, BAND_MIN_MAX, BAND_PERCENTILES, BAND_NONE)
+
+    def __init__(self, parent, plotter, label):
+        super(PlotLinePhaseAveragedView, self).__init__(parent, plotter, label)
+
+        self.torque = None
+        self.patches = []
+        self.start_range = 1.0
+        self.end_range = 2.0
+        self.band = self.BAND_STD
+        self.band_handle = None
+
+        # build interface components
+        face_patch = interface_build.face_patch_selector(self, patches_connect=self.set_patches)
+
+        revs = interface_build.revolution_range_selector(self, self.start_range, self.end_range,
+                                                         range_connect=self.set_range)
+
+        sim_select = interface_build.simulation_selector(self, torque_connect=(self.set_torque_file,
+                                                                               face_patch.set_torque,
+                                                                               revs.set_max_from_torque_revs),
+                                                         torque_appended_connect=(revs.update_max_from_torque_revs,
+                                                                                  self.do_plot),
+                                                         torque_reloaded_connect=(revs.update_max_from_torque_revs,
+                                                                                  self.do_plot))
+
+        band_select = QtWidgets.QComboBox(self)
+        band_select.addItems(self.bands)
+        band_select.currentTextChanged.connect(self.set_band)
+
+        self.layout().addWidget(sim_select)
+        self.layout().addWidget(face_patch)
+        self.layout().addWidget(revs)
+        self.layout().addWidget(QtWidgets.QLabel("Shaded band:", self))
+        self.layout().addWidget(band_select)
+
+    def set_torque_file(self, torque_file):
+        self.torque = torque_file
+        self.plotter.set_convert(torque_file.delta_t(), torque_file.params.StepsPerRev)
+        self.do_plot()
+
+    def set_range(self, start, end):
+        self.start_range = start
+        self.end_range = end
+        self.do_plot()
+
+    def set_patches(self, patches):
+        self.patches = patches
+        self.do_plot()
+
+    def set_band(self, band):
+        self.band = band
+        self.do_plot()
+
+    def do_plot(self):
+        if self.torque is not None and len(self.patches) > 0:
+            try:
+                statistics = self.compute()
+                self.plotter.plot(statistics.phase, statistics.mean)
+                self.plot_band(statistics)
+            except NoPatchesError:
+                pass
+            except Exception as err:
+                self.plotter.plot([], [])
+                self.plot_band(None)
+                qt_error_handling.python_exception_dialog(err, self)
+
+    def plot_band(self, statistics):
+        if statistics is None or self.band == self.BAND_NONE:
+            if self.band_handle is not None:
+                self.plotter.clear(self.band_handle)
+                self.band_handle = None
+            return
+
+        if self.band == self.BAND_STD:
+            lower, upper = statistics.mean - statistics.std, statistics.mean + statistics.std
+        elif self.band == self.BAND_MIN_MAX:
+            lower, upper = statistics.min, statistics.max
+        else:
+            lower, upper = statistics.percentiles[5], statistics.percentiles[95]
+
+        self.band_handle = self.plotter.fill_between(statistics.phase, lower, upper, handle=self.band_handle)
+        self.plotter.redraw()
+
+
+class PlotLinePhaseAveragedTorque(PlotLinePhaseAveragedView):
+    def compute(self):
+        return self.torque.phase_statistics(patches=self.patches, start_rev=self.start_range,
+                                            end_rev=self.end_range)
+
+    def help(self):
+        return 'Sum of torque over specified patches at each phase of a revolution, averaged over the ' \
+               'revolutions in the range, with a shaded band showing its spread.'
+
+
+class PlotLinePhaseAveragedCp(PlotLinePhaseAveragedView):
+    def compute(self):
+        return self.torque.phase_statistics(patches=self.patches, start_rev=self.start_range,
+                                            end_rev=self.end_range, cp=True)
+
+    def help(self):
+        return 'Cp over specified patches at each phase of a revolution, averaged over the revolutions ' \
+               'in the range, with a shaded band showing its spread.'
@@ -1,34 +1,61 @@
+import numpy as np
+
 from computation.torque import NoPatchesError
 from main_window.plot_line_bases import PlotLineView
+from plot_types.convergence_marker import ConvergenceMarker
 from sidebar_selectors import interface_build
 import qt_error_handling
 
 
 class PlotLineSlidingWindowView(PlotLineView):
+    # window lengths (in revolutions) which can be plotted for comparison, and their line styles
+    COMPARISON_WINDOWS = (1, 2, 5)
+    COMPARISON_LINESTYLES = (':', '--', '-.')
+
     def __init__(self, parent, plotter, label):
         super(PlotLineSlidingWindowView, self).__init__(parent, plotter, label)
         self.torque = None
         self.patches = []
         self.num_revs_window = 1
 
+        # handles of lines for comparison window lengths
+        self.comparison_windows = ()
+        self.comparison_handles = dict({})
+
+        # selectors may plot while they are built (e.g. when a simulation is already selected), which
+        # updates the convergence marker
+        self.convergence = ConvergenceMarker(self)
+
         # build interface components
         patch_select = interface_build.face_patch_selector(self, patches_connect=self.patches_changed)
 
         sim_select = interface_build.simulation_selector(self, torque_connect=(patch_select.set_torque,
-                                                                               self.set_torque))
+                                                                               self.set_torque),
+                                                         torque_appended_connect=self.append_time_steps,
+                                                         torque_reloaded_connect=self.plot)
 
         num_revs = interface_build.revolution_count_selector(self, self.num_revs_window,
                                                              revs_change_connect=self.set_num_revs)
 
+        compare = interface_build.value_checkbox_selector(self, 'Compare Revolution Counts',
+                                                          self.COMPARISON_WINDOWS,
+                                                          selection_connect=self.set_comparison_windows)
+
         # layout
         self.layout().addWidget(sim_select)
         self.layout().addWidget(patch_select)
         self.layout().addWidget(num_revs)
+        self.layout().addWidget(compare)
+        self.layout().addWidget(self.convergence.selector)
 
     def set_num_revs(self, num_revs):
         self.num_revs_window = float(num_revs)
         self.plot()
 
+    def set_comparison_windows(self, windows):
+        self.comparison_windows = tuple(windows)
+        self.plot()
+
     def patches_changed(self, patches):
         self.patches = patches
         self.plot()
@@ -41,30 +68,73 @@ class PlotLineSlidingWindowView(PlotLineView):
         if self.torque is not None and self.patches is not None:
             try:
                 try:
-                    x, y = self.compute_value(self.torque)
-                    self.plotter.plot(x, y)
+                    # all window lengths are computed from a single cumulative sum
+                    values = self.compute_values(self.torque, (self.num_revs_window,) + self.comparison_windows)
+                except NoPatchesError:
+                    values = [([], [])] * (1 + len(self.comparison_windows))
+
+                x, y = values[0]
+                self.plotter.plot(x, y)
+                self.plot_comparisons(dict(zip(self.comparison_windows, values[1:])))
+            except Exception as error:
+                qt_error_handling.python_exception_dialog(error, self)
+            self.convergence.update()
+
+    def plot_comparisons(self, values):
+        # plot a line for each comparison window length, removing lines no longer selected
+        for window in list(self.comparison_handles.keys()):
+            if window not in values:
+                self.plotter.clear(self.comparison_handles.pop(window))
+
+        for window, (x, y) in values.items():
+            handle = self.plotter.auxplot(x, y, handle=self.comparison_handles.get(window))
+            linestyle = self.COMPARISON_LINESTYLES[self.COMPARISON_WINDOWS.index(window)]
+            self.plotter.set_properties(handle, linestyle=linestyle, linewidth=1)
+            self.comparison_handles[window] = handle
+
+        self.plotter.redraw()
+
+    def append_time_steps(self, num_time_steps):
+        # extend the plotted line with the windows ending in the appended time steps only
+        if self.torque is not None and self.patches is not None:
+            try:
+                try:
+                    x, y = self.compute_value(self.torque, first_window=self.plotter.num_points())
+                    self.plotter.extend(x, y)
+
+                    for window, handle in self.comparison_handles.items():
+                        x_old, y_old = handle.mydata
+                        x, y = self.compute_values(self.torque, (window,), first_window=len(x_old))[0]
+                        self.plotter.auxplot(np.append(x_old, x), np.append(y_old, y), handle=handle)
+                    self.plotter.redraw()
                 except NoPatchesError:
-                    self.plotter.plot([], [])
+                    pass
             except Exception as error:
-                qt_error_handling.python_exception_dialog(error, parent)
+                qt_error_handling.python_exception_dialog(error, self)
+            self.convergence.update()
+
+    def compute_value(self, torque, first_window=0):
+        return self.compute_values(torque, (self.num_revs_window,), first_window=first_window)[0]
 
-    def compute_value(self, torque):
-        return [], []
+    # returns a list of (x, y) for each window length
+    def compute_values(self, torque, n_revs_windows, first_window=0):
+        return [([], []) for _ in n_revs_windows]
 
 
 class PlotLineCpSlidingWindowView(PlotLineSlidingWindowView):
-    def compute_value(self, torque):
-        y, x = torque.cp_mean_over_sliding_window(n_revs_window=self.num_revs_window, patches=self.patches)
-        return x, y
+    def compute_values(self, torque, n_revs_windows, first_window=0):
+        values = torque.cp_mean_over_sliding_windows(n_revs_windows, patches=self.patches, first_window=first_window)
+        return [(x, y) for y, x in values]
 
     def help(self):
         return 'Mean cp, considering selected patches, averaged over a sliding window in time.'
 
 
 class PlotLineTorqueSlidingWindowView(PlotLineSlidingWindowView):
-    def compute_value(self, torque):
-        y, x = torque.total_torque_mean_over_sliding_window(n_revs_window=self.num_revs_window, patches=self.patches)
-        return x, y
+    def compute_values(self, torque, n_revs_windows, first_window=0):
+        values = torque.total_torque_mean_over_sliding_windows(n_revs_windows, patches=self.patches,
+                                                               first_window=first_window)
+        return [(x, y) for y, x in values]
 
     def help(self):
         return 'Sum of torques over selected patches, averaged over a sliding window in time.'
@@ -0,0 +1,113 @@
+from PyQt5 import QtWidgets
+
+import qt_error_handling
+from computation.torque import NoPatchesError
+from main_window.plot_line_bases import PlotLineView
+from sidebar_selectors import interface_build
+
+
+class PlotLineSpectrumView(PlotLineView):
+    # units of the frequency axis
+    AXIS_HERTZ = 'Frequency (Hz)'
+    AXIS_HARMONICS = 'Harmonic of rotor frequency'
+
+    axes = (AXIS_HERTZ, AXIS_HARMONICS)
+
+    def __init__(self, parent, plotter, label):
+        super(PlotLineSpectrumView, self).__init__(parent, plotter, label)
+
+        self.torque = None
+        self.patches = []
+        self.start_range = 1.0
+        self.end_range = 2.0
+        self.revs_per_segment = 1
+        self.axis = self.AXIS_HERTZ
+
+        # build interface components
+        face_patch = interface_build.face_patch_selector(self, patches_connect=self.set_patches)
+
+        revs = interface_build.revolution_range_selector(self, self.start_range, self.end_range,
+                                                         range_connect=self.set_range)
+
+        sim_select = interface_build.simulation_selector(self, torque_connect=(self.set_torque_file,
+                                                                               face_patch.set_torque,
+                                                                               revs.set_max_from_torque_revs),
+                                                         torque_appended_connect=(revs.update_max_from_torque_revs,
+                                                                                  self.do_plot),
+                                                         torque_reloaded_connect=(revs.update_max_from_torque_revs,
+                                                                                  self.do_plot))
+
+        segment = interface_build.integer_selector(self, 'Revolutions per Segment', self.revs_per_segment, 1, 1000,
+                                                   value_connect=self.set_revs_per_segment)
+
+        axis_select = QtWidgets.QComboBox(self)
+        axis_select.addItems(self.axes)
+        axis_select.currentTextChanged.connect(self.set_axis)
+
+        self.layout().addWidget(sim_select)
+        self.layout().addWidget(face_patch)
+        self.layout().addWidget(revs)
+        self.layout().addWidget(segment)
+        self.layout().addWidget(QtWidgets.QLabel("Frequency axis:", self))
+        self.layout().addWidget(axis_select)
+
+    def set_torque_file(self, torque_file):
+        self.torque = torque_file
+        self.do_plot()
+
+    def set_range(self, start, end):
+        self.start_range = start
+        self.end_range = end
+        self.do_plot()
+
+    def set_patches(self, patches):
+        self.patches = patches
+        self.do_plot()
+
+    def set_revs_per_segment(self, revs_per_segment):
+        self.revs_per_segment = revs_per_segment
+        self.do_plot()
+
+    def set_axis(self, axis):
+        self.axis = axis
+        self.do_plot()
+
+    def do_plot(self):
+        if self.torque is not None and len(self.patches) > 0:
+            try:
+                psd, frequencies = self.compute()
+
+                if self.axis == self.AXIS_HARMONICS:
+                    frequencies = frequencies / self.torque.rotor_frequency()
+
+                # the mean of each segment is removed, so the zero frequency is omitted
+                self.plotter.plot(frequencies[1:], psd[1:])
+
+                # spectra have a window of their own (see MPLWidget.SpectrumPlot)
+                self.plotter.ax.set_xlabel(self.axis)
+                self.plotter.redraw()
+            except NoPatchesError:
+                pass
+            except Exception as err:
+                self.plotter.plot([], [])
+                qt_error_handling.python_exception_dialog(err, self)
+
+
+class PlotLineTorqueSpectrum(PlotLineSpectrumView):
+    def compute(self):
+        return self.torque.total_torque_spectrum(start_rev=self.start_range, end_rev=self.end_range,
+                                                 patches=self.patches, revs_per_segment=self.revs_per_segment)
+
+    def help(self):
+        return 'Power spectral density of the sum of torque over specified patches, over the revolutions ' \
+               'in the range, averaged over overlapping segments.'
+
+
+class PlotLineCpSpectrum(PlotLineSpectrumView):
+    def compute(self):
+        return self.torque.cp_spectrum(start_rev=self.start_range, end_rev=self.end_range, patches=self.patches,
+                                       revs_per_segment=self.revs_per_segment)
+
+    def help(self):
+        return 'Power spectral density of Cp over specified patches, over the revolutions in the range, ' \
+               'averaged over overlapping segments.'
@@ -1,6 +1,7 @@
 from PyQt5 import QtWidgets
 import qt_error_handling
 from main_window.plot_line_bases import PlotLineView
+from plot_types.convergence_marker import ConvergenceMarker
 from sidebar_selectors import interface_build
 
 
@@ -11,14 +12,22 @@ class PlotLineTransientValuesView(PlotLineView):
         self.torque = None
         self.patches = []
 
+        # selectors may plot while they are built (e.g. when a simulation is already selected), which
+        # updates the convergence marker
+        self.convergence = ConvergenceMarker(self)
+
         # build interface components
         face_patch = interface_build.face_patch_selector(self, patches_connect=self.set_patches)
 
         sim_select = interface_build.simulation_selector(self, torque_connect=(self.set_torque_file,
-                                                                               face_patch.set_torque))
+                                                                               face_patch.set_torque),
+                                                         torque_appended_connect=self.append_time_steps,
+                                                         torque_reloaded_connect=self.do_plot)
+
         # add face patch selector
         self.layout().addWidget(sim_select)
         self.layout().addWidget(face_patch)
+        self.layout().addWidget(self.convergence.selector)
 
     def set_torque_file(self, torque_file):
         self.torque = torque_file
@@ -42,30 +51,44 @@ class PlotLineTransientValuesView(PlotLineView):
             except Exception as err:
                 self.plotter.plot([], [])
                 qt_error_handling.python_exception_dialog(err, self)
+            self.convergence.update()
+
+    def append_time_steps(self, num_time_steps):
+        # extend the plotted line with values for the appended time steps only
+        if self.torque is not None and len(self.patches) > 0:
+            try:
+                time_steps, values = self.compute(first_time_step=self.plotter.num_points())
+                self.plotter.extend(time_steps, values)
+            except Exception as err:
+                qt_error_handling.python_exception_dialog(err, self)
+            self.convergence.update()
 
 
 class PlotLineTransientTotalTorque(PlotLineTransientValuesView):
-    def compute(self):
-        total_torque_per_time_step = self.torque.total_torque_per_time_step(patches=self.patches)
-        return self.torque.time_steps, total_torque_per_time_step
+    def compute(self, first_time_step=0):
+        total_torque_per_time_step = self.torque.total_torque_per_time_step(patches=self.patches,
+                                                                            first_time_step=first_time_step)
+        return self.torque.time_steps[first_time_step:], total_torque_per_time_step
 
     def help(self):
         return 'Sum of torque over all specified patches for each time step.'
 
 
 class PlotLineTransientMeanTorque(PlotLineTransientValuesView):
-    def compute(self):
-        total_torque_per_time_step = self.torque.total_torque_per_time_step(patches=self.patches)
+    def compute(self, first_time_step=0):
+        total_torque_per_time_step = self.torque.total_torque_per_time_step(patches=self.patches,
+                                                                            first_time_step=first_time_step)
         mean_torque_per_time_step = total_torque_per_time_step / len(self.patches)
-        return self.torque.time_steps, mean_torque_per_time_step
+        return self.torque.time_steps[first_time_step:], mean_torque_per_time_step
 
     def help(self):
         return 'Mean torque over specified patches for each time step.'
 
 
 class PlotLineTransientCp(PlotLineTransientValuesView):
-    def compute(self):
-        cp_per_time_step, time_steps = self.torque.cp_per_time_step(patches=self.patches)
+    def compute(self, first_time_step=0):
+        cp_per_time_step, time_steps = self.torque.cp_per_time_step(patches=self.patches,
+                                                                    first_time_step=first_time_step)
         return time_steps, cp_per_time_step
 
     def help(self):
@@ -3,7 +3,10 @@ import collections
 from sidebar_selectors.selector_revolution_count import RevCountSelector
 from sidebar_selectors.selector_revolution_range_ import RevolutionRangeSelector
 from sidebar_selectors.selector_simulation import SimulationSelectionSidebarWidget
+from sidebar_selectors.selector_convergence import ConvergenceSelector
 from sidebar_selectors.selector_face_patches import FacePatchSelector
+from sidebar_selectors.selector_integer import IntegerSelector
+from sidebar_selectors.selector_value_checkbox import ValueCheckboxSelector
 
 
 def revolution_range_selector(parent, default_start, default_end, range_connect=None):
@@ -19,11 +22,14 @@ def revolution_range_selector(parent, default_start, default_end, range_connect=
 LastSimulationSelected = None
 
 
-def simulation_selector(parent, torque_connect=None, simulation_connect=None):
+def simulation_selector(parent, torque_connect=None, simulation_connect=None, torque_appended_connect=None,
+                        torque_reloaded_connect=None):
     sim_select = SimulationSelectionSidebarWidget(parent)
 
     connect_signals(sim_select.sigTorqueLoaded, torque_connect)
     connect_signals(sim_select.sigSimulationLoaded, simulation_connect)
+    connect_signals(sim_select.sigTorqueAppended, torque_appended_connect)
+    connect_signals(sim_select.sigTorqueReloaded, torque_reloaded_connect)
 
     sim_select.sigSimulationSelected.connect(set_last_selected_simulation)
 
@@ -57,6 +63,33 @@ def revolution_count_selector(parent, num_revs_window, revs_change_connect=None)
     return revs
 
 
+def integer_selector(parent, label, value, minimum, maximum, value_connect=None):
+    integer_select = IntegerSelector(value, minimum, maximum, parent=parent, label=label)
+
+    connect_signals(integer_select.sigValueChanged, value_connect)
+
+    return integer_select
+
+
+def convergence_selector(parent, tolerance, convergence_connect=None):
+    convergence = ConvergenceSelector(tolerance, parent=parent)
+
+    connect_signals(convergence.sigConvergenceChanged, convergence_connect)
+
+    return convergence
+
+
+def value_checkbox_selector(parent, label, values, columns=3, selection_connect=None):
+    value_select = ValueCheckboxSelector(label=label, parent=parent)
+    value_select.set_num_columns(columns)
+
+    connect_signals(value_select.sigSelectionChanged, selection_connect)
+
+    value_select.set_values(values)
+
+    return value_select
+
+
 def connect_signals(signal, slots):
     if slots is not None:
         if not isinstance(slots, collections.Iterable):
@@ -0,0 +1,139 @@
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+
+class RangeSlider(QtWidgets.QWidget):
+    # horizontal slider with two handles, selecting a range of integer values. dragging a handle moves
+    # one end of the range, dragging between the handles moves the whole range.
+    sigRangeChanged = QtCore.pyqtSignal(int, int)
+
+    HANDLE_WIDTH = 8
+    GROOVE_HEIGHT = 4
+
+    DRAG_LOW = 1
+    DRAG_HIGH = 2
+    DRAG_RANGE = 3
+
+    def __init__(self, parent=None, minimum=0, maximum=100):
+        super(RangeSlider, self).__init__(parent)
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.low = minimum
+        self.high = maximum
+
+        # current drag, and the mouse value and range when the drag started
+        self._drag = None
+        self._drag_origin = None
+
+        self.setMinimumHeight(3 * self.HANDLE_WIDTH)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+
+    def set_limits(self, minimum, maximum):
+        self.minimum = minimum
+        self.maximum = max(minimum + 1, maximum)
+        self.set_values(self.low, self.high)
+
+    def set_values(self, low, high):
+        # set the selected range, without emitting sigRangeChanged. the range is at least one value long.
+        self.low = min(max(low, self.minimum), self.maximum - 1)
+        self.high = min(max(high, self.low + 1), self.maximum)
+        self.update()
+
+    def values(self):
+        return self.low, self.high
+
+    #
+    # Conversion between values and pixel positions
+    #
+
+    def _span(self):
+        return max(1, self.width() - self.HANDLE_WIDTH)
+
+    def _position(self, value):
+        if self.maximum == self.minimum:
+            return self.HANDLE_WIDTH // 2
+        fraction = (value - self.minimum) / (self.maximum - self.minimum)
+        return int(round(self.HANDLE_WIDTH / 2 + fraction * self._span()))
+
+    def _value(self, position):
+        fraction = (position - self.HANDLE_WIDTH / 2) / self._span()
+        value = int(round(self.minimum + fraction * (self.maximum - self.minimum)))
+        return min(max(value, self.minimum), self.maximum)
+
+    #
+    # Painting and mouse interaction
+    #
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        palette = self.palette()
+        middle = self.height() // 2
+
+        groove = QtCore.QRect(self.HANDLE_WIDTH // 2, middle - self.GROOVE_HEIGHT // 2,
+                              self._span(), self.GROOVE_HEIGHT)
+        painter.fillRect(groove, palette.mid())
+
+        low = self._position(self.low)
+        high = self._position(self.high)
+        selected = QtCore.QRect(low, middle - self.GROOVE_HEIGHT // 2, high - low, self.GROOVE_HEIGHT)
+        painter.fillRect(selected, palette.highlight())
+
+        painter.setPen(palette.dark().color())
+        painter.setBrush(palette.button())
+        for position in (low, high):
+            painter.drawRect(position - self.HANDLE_WIDTH // 2, middle - self.HANDLE_WIDTH,
+                             self.HANDLE_WIDTH - 1, 2 * self.HANDLE_WIDTH - 1)
+
+    def mousePressEvent(self, event):
+        x = event.pos().x()
+        low = self._position(self.low)
+        high = self._position(self.high)
+
+        if abs(x - high) <= self.HANDLE_WIDTH and abs(x - high) <= abs(x - low):
+            self._drag = self.DRAG_HIGH
+        elif abs(x - low) <= self.HANDLE_WIDTH:
+            self._drag = self.DRAG_LOW
+        elif low < x < high:
+            self._drag = self.DRAG_RANGE
+        else:
+            # jump the nearest handle to the mouse
+            self._drag = self.DRAG_LOW if abs(x - low) < abs(x - high) else self.DRAG_HIGH
+            self.mouseMoveEvent(event)
+
+        self._drag_origin = (self._value(x), self.low, self.high)
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            return
+
+        value = self._value(event.pos().x())
+        low, high = self.low, self.high
+
+        if self._drag == self.DRAG_LOW:
+            low = min(value, self.high - 1)
+        elif self._drag == self.DRAG_HIGH:
+            high = max(value, self.low + 1)
+        else:
+            value_origin, low_origin, high_origin = self._drag_origin
+            shift = value - value_origin
+            shift = min(max(shift, self.minimum - low_origin), self.maximum - high_origin)
+            low, high = low_origin + shift, high_origin + shift
+
+        if (low, high) != (self.low, self.high):
+            self.set_values(low, high)
+            self.sigRangeChanged.emit(self.low, self.high)
+
+    def mouseReleaseEvent(self, event):
+        self._drag = None
+        self._drag_origin = None
+
+
+if __name__ == "__main__":
+    import sys
+
+    app = QtWidgets.QApplication(sys.argv)
+
+    slider = RangeSlider(minimum=0, maximum=200)
+    slider.sigRangeChanged.connect(print)
+    slider.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,63 @@
+from PyQt5 import QtGui, QtCore, QtWidgets
+
+from sidebar_selectors.base_class_selector import SidebarSelectorBase
+
+
+class ConvergenceSelector(SidebarSelectorBase):
+    # enables a marker at the revolution after which the change in mean Cp between consecutive
+    # revolutions stays within a tolerance
+    sigConvergenceChanged = QtCore.pyqtSignal(bool, float)
+
+    def __init__(self, tolerance, parent=None, label='Periodic Convergence'):
+        super(ConvergenceSelector, self).__init__(parent, label=label, layout=SidebarSelectorBase.GRID_LAYOUT)
+
+        self.validator = QtGui.QDoubleValidator(0.0, 100.0, 6, parent)
+        self.tolerance = tolerance
+
+        self.enabled_checkbox = QtWidgets.QCheckBox(self)
+        self.enabled_checkbox.setText("Mark converged revolution")
+        self.enabled_checkbox.toggled.connect(self.emit_convergence_changed)
+
+        label = QtWidgets.QLabel(self)
+        label.setText("Cp tolerance:")
+
+        ctl = QtWidgets.QLineEdit(self)
+        ctl.setText("%g" % tolerance)
+        ctl.setValidator(self.validator)
+        ctl.textChanged.connect(self.text_changed)
+
+        self.layout().addWidget(self.enabled_checkbox, 1, 0, 1, 2)
+        self.layout().addWidget(label, 2, 0, 1, 1)
+        self.layout().addWidget(ctl, 2, 1, 1, 1)
+
+    def emit_convergence_changed(self):
+        self.sigConvergenceChanged.emit(self.enabled_checkbox.isChecked(), self.tolerance)
+
+    def text_changed(self, text):
+        form_widget = self.sender()
+        state = self.validator.validate(form_widget.text(), 0)[0]
+
+        try:
+            val = float(text)
+        except ValueError:
+            state = QtGui.QValidator.Invalid
+
+        if state == QtGui.QValidator.Acceptable and val > 0:
+            color = '#ffffff'  # white
+            self.tolerance = val
+            self.emit_convergence_changed()
+        elif state == QtGui.QValidator.Intermediate:
+            color = '#fff79a'  # yellow
+        else:
+            color = '#f6989d'  # red
+        form_widget.setStyleSheet('QLineEdit { background-color: %s }' % color)
+
+
+if __name__ == "__main__":
+    import sys
+
+    app = QtWidgets.QApplication(sys.argv)
+    widget = ConvergenceSelector(0.01)
+    widget.sigConvergenceChanged.connect(print)
+    widget.show()
+    sys.exit(app.exec_())
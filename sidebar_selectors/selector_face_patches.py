@@ -1,8 +1,14 @@
+from PyQt5 import QtWidgets
+
+from computation.torque import NoPatchesError
 from sidebar_selectors.selector_value_checkbox import ValueCheckboxSelector
 
 
 class FacePatchSelector(ValueCheckboxSelector):
     def __init__(self, parent=None, label='Select Face Patches'):
+        self.torque = None
+        self.new_group_button = None
+        self.group_buttons = []
         super(FacePatchSelector, self).__init__(label=label, parent=parent)
 
     def set_simulation(self, simulation):
@@ -13,9 +19,69 @@ class FacePatchSelector(ValueCheckboxSelector):
         self.set_values(face_patches, num_face_patches)
 
     def set_torque(self, torque):
-        # populate face_patch_selector
+        # populate face_patch_selector with the recorded patch ids, which the torque file
+        # maps to its columns (see TorqueFile.patch_columns)
+        self.torque = torque
         if torque is not None:
-            self.set_values(torque.patches)
+            self.set_values([int(patch) for patch in torque.patches])
+
+            # saves the selected patches as a named patch group of the torque file
+            self.new_group_button = QtWidgets.QPushButton(self)
+            self.new_group_button.setText('New Patch Group')
+            self.new_group_button.clicked.connect(self.new_patch_group)
+
+            self.row += 1
+            self.layout().addWidget(self.new_group_button, self.row, 0, 1, self.columns)
+            self.group_row = self.row
+
+            self.set_group_buttons()
+
+    def new_patch_group(self):
+        name, ok = QtWidgets.QInputDialog.getText(self, 'New Patch Group', 'Name of the selected patches:')
+        if ok and len(name) > 0:
+            self.add_patch_group(name, self.selected_values)
+
+    def add_patch_group(self, name, patches):
+        try:
+            self.torque.add_patch_group(name, patches)
+        except NoPatchesError:
+            QtWidgets.QMessageBox.information(self, "Warning", "No face patches selected for the patch group.",
+                                              QtWidgets.QMessageBox.Ok)
+            return
+
+        self.set_group_buttons()
+
+    def set_group_buttons(self):
+        # buttons selecting the patches of each named patch group, below the new group button
+        self.remove_group_buttons()
+
+        self.row = self.group_row
+        for name, patches in self.torque.patch_groups.items():
+            self.add_group_button(name, patches)
+
+    def add_group_button(self, name, patches):
+        button = QtWidgets.QPushButton(self)
+        button.setText(name)
+        button.clicked.connect(lambda checked=False, values=patches: self.select_values(values))
+
+        self.row += 1
+        self.layout().addWidget(button, self.row, 0, 1, self.columns)
+        self.group_buttons.append(button)
+
+    def reset(self):
+        super(FacePatchSelector, self).reset()
+
+        self.remove_group_buttons()
+        if self.new_group_button is not None:
+            self.layout().removeWidget(self.new_group_button)
+            self.new_group_button.deleteLater()
+            self.new_group_button = None
+
+    def remove_group_buttons(self):
+        for button in self.group_buttons:
+            self.layout().removeWidget(button)
+            button.deleteLater()
+        self.group_buttons = []
 
     def set_values(self, indexes, counts=None, limit=10000):
         super(FacePatchSelector, self).set_values(indexes)
@@ -32,7 +98,6 @@ class FacePatchSelector(ValueCheckboxSelector):
 
 if __name__ == "__main__":
     import sys
-    from PyQt5 import QtWidgets
 
     app = QtWidgets.QApplication(sys.argv)
     widget = FacePatchSelector()
@@ -0,0 +1,30 @@
+from PyQt5 import QtCore, QtWidgets
+
+from sidebar_selectors.base_class_selector import SidebarSelectorBase
+
+
+class IntegerSelector(SidebarSelectorBase):
+    sigValueChanged = QtCore.pyqtSignal(int)
+
+    def __init__(self, value, minimum, maximum, parent=None, label='Select Value'):
+        super(IntegerSelector, self).__init__(parent, label=label)
+
+        self.spin_box = QtWidgets.QSpinBox(self)
+        self.spin_box.setRange(minimum, maximum)
+        self.spin_box.setValue(value)
+
+        # only emit once editing is finished, rather than for each digit typed
+        self.spin_box.setKeyboardTracking(False)
+        self.spin_box.valueChanged.connect(self.sigValueChanged.emit)
+
+        self.layout().addWidget(self.spin_box)
+
+
+if __name__ == "__main__":
+    import sys
+
+    app = QtWidgets.QApplication(sys.argv)
+    widget = IntegerSelector(200, 1, 3600)
+    widget.sigValueChanged.connect(print)
+    widget.show()
+    sys.exit(app.exec_())
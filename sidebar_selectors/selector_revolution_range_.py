@@ -1,14 +1,19 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
 from sidebar_selectors.base_class_selector import SidebarSelectorBase
+from sidebar_selectors.range_slider import RangeSlider
 from sidebar_selectors.selector_time_units import UnitsComboBox
 
 
 class RevolutionRangeSelector(SidebarSelectorBase):
     sigRangeChanged = QtCore.pyqtSignal(float, float, int)
 
+    # slider positions per revolution (matching the single decimal place of the text boxes)
+    SLIDER_STEPS_PER_REV = 10
+
     def __init__(self, parent=None):
         super(RevolutionRangeSelector, self).__init__(parent, 'Select Revolution Range', layout=SidebarSelectorBase.GRID_LAYOUT)
+        self.torque = None
 
     def init(self, start, end, max=20.0):
         # create form validator
@@ -32,16 +37,41 @@ class RevolutionRangeSelector(SidebarSelectorBase):
         units.selection_changed()
         self.layout().addWidget(units, 3, 1)
 
+        # dragging the slider updates the range continuously (revolution 0 is not a valid start)
+        self.slider = RangeSlider(self, minimum=1, maximum=self.slider_position(max))
+        self.slider.set_values(self.slider_position(start), self.slider_position(end))
+        self.slider.sigRangeChanged.connect(self.slider_moved)
+        self.layout().addWidget(self.slider, 4, 0, 1, 2)
+
         self.emit_range_changed()
 
     def units_changed(self, units):
         self.units = units
 
     def set_max_from_torque_revs(self, torque):
+        self.torque = torque
         if torque is not None:
-            self.validator = QtGui.QDoubleValidator(0.0, torque.num_revs(), 1)
+            # the text boxes share the validator, so its limit is changed rather than replacing it
+            self.validator.setTop(torque.num_revs())
+            self.slider.set_limits(1, int(torque.num_revs() * self.SLIDER_STEPS_PER_REV))
             self.check_state()
 
+    def update_max_from_torque_revs(self, num_time_steps=None):
+        # the number of revolutions grows as time steps are appended to the torque file
+        self.set_max_from_torque_revs(self.torque)
+
+    def slider_position(self, rev):
+        return int(round(rev * self.SLIDER_STEPS_PER_REV))
+
+    def slider_moved(self, low, high):
+        # update both text boxes before checking the range, so the intermediate range is never emitted
+        for form_widget, position in ((self.start_le, low), (self.end_le, high)):
+            form_widget.blockSignals(True)
+            form_widget.setText("%.1f" % (position / self.SLIDER_STEPS_PER_REV))
+            form_widget.blockSignals(False)
+
+        self.check_state()
+
     def add_row(self, string, value, row):
         label = QtWidgets.QLabel(self)
         label.setText(string)
@@ -59,6 +89,8 @@ class RevolutionRangeSelector(SidebarSelectorBase):
                     and self.check_widget_level_state()
 
         if condition:
+            self.slider.set_values(self.slider_position(self.start), self.slider_position(self.end))
+
             if self.prev is None or self.start != self.prev[0] or self.end != self.prev[1]:
                 self.emit_range_changed()
 
@@ -2,7 +2,7 @@ import os
 
 from PyQt5 import QtWidgets, QtCore, QtGui
 
-from Simulation import Simulation, NoSimulationParamsFile
+from Simulation import Simulation, NoSimulationParamsFile, SimulationRegistryInstance
 from computation.inform import InformFile
 from computation.torque import TorqueFile
 from sidebar_selectors.base_class_selector import SidebarSelectorBase
@@ -14,6 +14,8 @@ class SimulationSelectionSidebarWidget(SidebarSelectorBase):
     sigSimulationLoaded = QtCore.pyqtSignal(Simulation)
     sigSimulationSelected = QtCore.pyqtSignal(Simulation)
     sigTorqueLoaded = QtCore.pyqtSignal(TorqueFile)
+    sigTorqueAppended = QtCore.pyqtSignal(int)
+    sigTorqueReloaded = QtCore.pyqtSignal()
 
     def __init__(self, parent=None):
         super(SimulationSelectionSidebarWidget, self).__init__(parent, 'Select Simulation')
@@ -37,6 +39,12 @@ class SimulationSelectionSidebarWidget(SidebarSelectorBase):
             self.set_simulation(self.dialog.simulation())
 
     def set_simulation(self, simulation):
+        if self.simulation is not None:
+            self.simulation.sigTorqueAppended.disconnect(self.sigTorqueAppended)
+            self.simulation.sigTorqueReloaded.disconnect(self.sigTorqueReloaded)
+        simulation.sigTorqueAppended.connect(self.sigTorqueAppended)
+        simulation.sigTorqueReloaded.connect(self.sigTorqueReloaded)
+
         self.simulation = simulation
         self.emit_simulation_selected()
         self.update_label()
@@ -113,8 +121,14 @@ class SimulationSelectionDialog(QtWidgets.QDialog, ui_SimulationSelectionDialog.
                 params = NoSimulationParamsFile()
             else:
                 params = InformFile(inform_file)
-                
-        simulation = Simulation(self.model, filename, params=params)
+
+        # a run which is already loaded (or loading) with the same parameters is shared, rather than read again
+        simulation = SimulationRegistryInstance.find(filename, params=params)
+        if simulation is not None:
+            self.tableView.selectRow(self.model.row_of(simulation))
+            return
+
+        simulation = SimulationRegistryInstance.simulation(self.model, filename, params=params)
         
         label = os.path.basename(os.path.dirname(filename))
 
@@ -138,6 +152,7 @@ class SimulationSelectionDialog(QtWidgets.QDialog, ui_SimulationSelectionDialog.
             index = self.model.createIndex(row, 0)
             simulation = self.model.simulation(index)
             simulation.disconnect_signals_from_item()
+            SimulationRegistryInstance.remove(simulation)
             self.model.removeRow(row)
             self.model.endRemoveRows()
 
@@ -254,6 +269,12 @@ class SimulationModel(QtGui.QStandardItemModel):
         item.setText(simulation.geo_file_name)
         self.setItem(0, 2, item)
 
+    def row_of(self, simulation):
+        for row in range(self.rowCount()):
+            if self.simulation(self.index(row, 0)) is simulation:
+                return row
+        return None
+
     def simulation(self, index):
         row = index.row()
         item = self.item(row, 1)
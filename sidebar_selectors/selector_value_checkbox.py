@@ -69,6 +69,13 @@ class ValueCheckboxSelector(SidebarSelectorBase):
             self.button_group.buttonClicked[int].connect(self.values_changed)
             self.emit_selection_changed()
 
+    def select_values(self, values):
+        # check exactly the checkboxes of values
+        for button in self.button_group.buttons():
+            button.setChecked(self.button_group.id(button) in values)
+        self.remove_all_checkbox_toggle()
+        self.emit_selection_changed()
+
     def remove_all_checkbox_toggle(self):
         self.all_checkbox.setChecked(False)
 
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.torque_precision import Params
+from computation.convergence import ConvergenceMonitor
+from computation.torque import TorqueFile
+
+
+class ConvergenceMonitorTest(unittest.TestCase):
+    PATCHES = (1, 2)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'TORQUE.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_revolutions(self, rev_cp, num_revs=None):
+        # torque file with the mean Cp over PATCHES of each revolution given by rev_cp (the torque is
+        # constant over each revolution), of which the first num_revs revolutions are written
+        steps_per_rev = Params.StepsPerRev
+        torque_per_cp = 1 / TorqueFile(self.file_name, params=Params()).cp(1.0)
+        num_revs = len(rev_cp) if num_revs is None else num_revs
+
+        with open(self.file_name, 'w') as file:
+            file.write('%d,%d\n' % (len(rev_cp) * steps_per_rev, len(self.PATCHES)))
+            file.write('time,omega,patch,torque,Fx,Fy,Fz,Xx,Xy,Xz,area\n')
+
+            for time_step in range(num_revs * steps_per_rev):
+                torque = rev_cp[time_step // steps_per_rev] * torque_per_cp / len(self.PATCHES)
+                for patch in self.PATCHES:
+                    file.write('%.8e,2.5,%d,%.17e,0,0,0,0,1,0,1\n' % (time_step * 1.0e-3, patch, torque))
+
+    def read(self):
+        torque_file = TorqueFile(self.file_name, params=Params(), use_cache=False)
+        try:
+            torque_file.read()
+        except EOFError:
+            # the file is written a few revolutions at a time
+            pass
+        return torque_file
+
+    def test_converged_revolution(self):
+        self.write_revolutions([0, 10, 10, 10, 10, 10])
+        monitor = ConvergenceMonitor(self.read(), self.PATCHES, tolerance=1)
+        monitor.update()
+
+        np.testing.assert_allclose(monitor.rev_cp(), [0, 10, 10, 10, 10, 10], atol=1e-9)
+
+        # revolution 2 differs from revolution 1 by 10, every later revolution is unchanged
+        self.assertEqual(monitor.converged_revolution(), 2)
+
+    def test_not_converged(self):
+        self.write_revolutions([0, 10, 10, 10])
+        monitor = ConvergenceMonitor(self.read(), self.PATCHES, tolerance=1)
+        monitor.update()
+
+        # only two changes within the tolerance
+        self.assertIsNone(monitor.converged_revolution())
+
+    def test_set_tolerance(self):
+        self.write_revolutions([0, 10, 10.5, 10, 10, 10, 10])
+        monitor = ConvergenceMonitor(self.read(), self.PATCHES, tolerance=1)
+        monitor.update()
+        self.assertEqual(monitor.converged_revolution(), 2)
+
+        monitor.set_tolerance(0.1)
+        self.assertEqual(monitor.converged_revolution(), 4)
+
+    def test_incremental_update(self):
+        rev_cp = [0, 10, 10, 12, 12, 12, 12]
+        self.write_revolutions(rev_cp, num_revs=3)
+        torque_file = self.read()
+        monitor = ConvergenceMonitor(torque_file, self.PATCHES, tolerance=1)
+        self.assertEqual(monitor.update(), 3)
+
+        self.write_revolutions(rev_cp)
+        torque_file.refresh()
+        self.assertEqual(monitor.update(), 4)
+
+        batch = ConvergenceMonitor(self.read(), self.PATCHES, tolerance=1)
+        batch.update()
+
+        np.testing.assert_allclose(monitor.differences(), batch.differences(), atol=1e-9)
+        self.assertEqual(monitor.converged_revolution(), 4)
+        self.assertEqual(batch.converged_revolution(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from PyQt5 import QtWidgets
+
+from benchmarks.torque_precision import Params
+from computation.torque import TorqueFile
+from sidebar_selectors.selector_face_patches import FacePatchSelector
+from tests.torque_files import write_torque_file
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+
+class FacePatchSelectorGroupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        file_name = os.path.join(self.directory.name, 'TORQUE.csv')
+        write_torque_file(file_name, 10, (1, 2, 3, 4))
+
+        self.torque_file = TorqueFile(file_name, params=Params(), use_cache=False)
+        self.torque_file.read()
+
+        self.selector = FacePatchSelector()
+        self.selector.set_torque(self.torque_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def group_names(self):
+        return [button.text() for button in self.selector.group_buttons]
+
+    def test_added_group_has_a_button(self):
+        self.selector.add_patch_group('blade 1', (1, 2))
+        self.selector.add_patch_group('blade 2', (3, 4))
+        self.assertEqual(self.group_names(), ['blade 1', 'blade 2'])
+        self.assertEqual(list(self.torque_file.patch_groups.keys()), ['blade 1', 'blade 2'])
+
+        self.selector.group_buttons[1].click()
+        self.assertEqual(sorted(self.selector.selected_values), [3, 4])
+
+    def test_buttons_of_existing_groups(self):
+        self.torque_file.add_patch_group('blade 1', (1, 2))
+        self.selector.set_torque(self.torque_file)
+        self.assertEqual(self.group_names(), ['blade 1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
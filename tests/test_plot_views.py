@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from PyQt5 import QtCore, QtWidgets
+
+from benchmarks.torque_precision import Params
+from computation.torque import TorqueFile
+from main_window.mpl_widget import MPLWidget
+from main_window.plot_line_bases import PlotLineModel
+from plot_types.sliding_window_plots import PlotLineCpSlidingWindowView, PlotLineTorqueSlidingWindowView
+from plot_types.transient_values import PlotLineTransientCp
+from sidebar_selectors import interface_build
+from Simulation import Simulation
+from tests.torque_files import write_torque_file
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+
+class LoadedSimulation(Simulation):
+    # a simulation whose torque file is already read, without a geometry
+    def __init__(self, torque_file):
+        QtCore.QObject.__init__(self)
+
+        self._torque = torque_file
+        self._geom = None
+        self._label = 'Loaded'
+        self.loaded = True
+
+    def progress(self):
+        return 1, 1
+
+
+class PlotViewConstructionTest(unittest.TestCase):
+    # views are built while a simulation is already selected, so their selectors plot during construction
+
+    VIEWS = (PlotLineCpSlidingWindowView, PlotLineTorqueSlidingWindowView, PlotLineTransientCp)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        file_name = os.path.join(cls.directory.name, 'TORQUE.csv')
+        write_torque_file(file_name, 1000, (1, 2, 3))
+
+        cls.torque_file = TorqueFile(file_name, params=Params(), use_cache=False)
+        cls.torque_file.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        interface_build.set_last_selected_simulation(LoadedSimulation(self.torque_file))
+
+    def tearDown(self):
+        interface_build.set_last_selected_simulation(None)
+
+    def test_construct_with_selected_simulation(self):
+        for view_class in self.VIEWS:
+            widget = MPLWidget(PlotLineModel(), options=(MPLWidget.TimePlot,))
+            view = view_class(None, widget.new_plotter(), view_class.__name__)
+
+            self.assertIs(view.torque, self.torque_file)
+            self.assertIsNotNone(view.convergence)
+
+            # the marker can be shown once the view is built
+            view.patches = (1, 2, 3)
+            view.convergence.set_convergence(True, 1.0)
+            self.assertIsNotNone(view.convergence.handle)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.torque_precision import Params
+from computation.torque import ResumedTorqueFile, TorqueFile
+
+
+class ResumedTorqueFileRefreshTest(unittest.TestCase):
+    PATCHES = (1, 2)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_names = [os.path.join(self.directory.name, name) for name in ('TORQUE.csv', 'TORQUE2.csv')]
+
+        # the second segment restarts from time step 150 of the first
+        self.write_segment(self.file_names[0], 0, 200)
+        self.write_segment(self.file_names[1], 150, 300)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_segment(self, file_name, first_time_step, num_time_steps, mode='w'):
+        with open(file_name, mode) as file:
+            if mode == 'w':
+                file.write('%d,%d\n' % (num_time_steps, len(self.PATCHES)))
+                file.write('time,omega,patch,torque,Fx,Fy,Fz,Xx,Xy,Xz,area\n')
+
+            for time_step in range(first_time_step, first_time_step + num_time_steps):
+                for patch in self.PATCHES:
+                    torque = 10.0 + patch + np.sin(0.1 * time_step)
+                    file.write('%.8e,2.5,%d,%.17e,0,0,0,0,1,0,1\n' % (time_step * 1.0e-3, patch, torque))
+
+    def test_refresh_extends_derived_quantities(self):
+        torque_file = ResumedTorqueFile(self.file_names, params=Params(), use_cache=False)
+        torque_file.read()
+
+        selection = torque_file.patch_selection(self.PATCHES)
+        torque_file.derived.get('total_torque', selection)
+        torque_file.derived.get('cumulative_torque', selection)
+
+        # the running solver appends to the last segment
+        self.write_segment(self.file_names[1], 450, 50, mode='a')
+        self.assertEqual(torque_file.refresh(), 50)
+
+        self.assertEqual(torque_file.num_time_steps, 500)
+        np.testing.assert_array_equal(torque_file.time_steps, np.arange(1, 501))
+
+        # the derived quantities are extended rather than discarded
+        self.assertIn(('total_torque', selection), torque_file.derived.results.keys())
+        self.assertIn(('cumulative_torque', selection), torque_file.derived.results.keys())
+
+        self.write_segment(self.file_names[0], 0, 500)
+        expected = TorqueFile(self.file_names[0], params=Params(), use_cache=False)
+        expected.read()
+        np.testing.assert_allclose(torque_file.derived.get('total_torque', selection),
+                                   expected.derived.get('total_torque', expected.patch_selection(self.PATCHES)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from PyQt5 import QtWidgets
+
+from benchmarks.torque_precision import Params
+from computation.torque import TorqueFile
+from sidebar_selectors.range_slider import RangeSlider
+from sidebar_selectors.selector_revolution_range_ import RevolutionRangeSelector
+from tests.torque_files import write_torque_file
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+
+class RangeSliderTest(unittest.TestCase):
+
+    def test_range_is_never_empty(self):
+        slider = RangeSlider(minimum=1, maximum=10)
+
+        slider.set_values(5, 5)
+        self.assertEqual(slider.values(), (5, 6))
+
+        slider.set_values(10, 10)
+        self.assertEqual(slider.values(), (9, 10))
+
+        slider.set_limits(1, 1)
+        self.assertEqual(slider.values(), (1, 2))
+
+
+class RevolutionRangeSelectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'TORQUE.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_maximum_follows_appended_time_steps(self):
+        steps_per_rev = Params.StepsPerRev
+        write_torque_file(self.file_name, 3 * steps_per_rev, (1, 2), steps_per_rev=steps_per_rev)
+        torque_file = TorqueFile(self.file_name, params=Params(), use_cache=False)
+        torque_file.read()
+
+        selector = RevolutionRangeSelector()
+        selector.init(1.0, 2.0)
+        selector.set_max_from_torque_revs(torque_file)
+        self.assertEqual(selector.slider.maximum, 3 * selector.SLIDER_STEPS_PER_REV)
+
+        # a running solver has written two more revolutions
+        write_torque_file(self.file_name, 5 * steps_per_rev, (1, 2), steps_per_rev=steps_per_rev)
+        torque_file.refresh()
+        selector.update_max_from_torque_revs(2 * steps_per_rev)
+
+        self.assertEqual(selector.slider.maximum, 5 * selector.SLIDER_STEPS_PER_REV)
+        self.assertEqual(selector.validator.top(), torque_file.num_revs())
+
+
+if __name__ == '__main__':
+    unittest.main()
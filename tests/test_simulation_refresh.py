@@ -0,0 +1,78 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from PyQt5 import QtCore, QtWidgets
+
+from benchmarks.torque_precision import Params
+from computation.torque import TorqueFile
+from Simulation import Simulation
+from tests.torque_files import write_torque_file
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+
+class WatchedSimulation(Simulation):
+    # a simulation watching its torque file, without a geometry
+    def __init__(self, file_name):
+        QtCore.QObject.__init__(self)
+
+        self.torque_watcher = QtCore.QFileSystemWatcher(self)
+        self._torque = TorqueFile(file_name, params=Params(), use_cache=False)
+        self._torque_file_id = self.torque_file_id()
+        self._torque.read()
+        self.start_watching_torque()
+
+
+class SimulationRefreshTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'TORQUE.csv')
+        write_torque_file(self.file_name, 200, (1, 2))
+
+        self.simulation = WatchedSimulation(self.file_name)
+        self.appended = []
+        self.reloaded = []
+        self.simulation.sigTorqueAppended.connect(self.appended.append)
+        self.simulation.sigTorqueReloaded.connect(lambda: self.reloaded.append(True))
+
+    def tearDown(self):
+        self.simulation.stop_watching_torque()
+        self.directory.cleanup()
+
+    def replace(self, num_time_steps):
+        # write a shorter file under a different name and move it over the torque file
+        replacement = os.path.join(self.directory.name, 'TORQUE.tmp')
+        write_torque_file(replacement, num_time_steps, (1, 2))
+        shutil.move(replacement, self.file_name)
+
+    def test_truncated_file_is_reloaded(self):
+        # rewritten in place, e.g. by a restarted solver
+        write_torque_file(self.file_name, 50, (1, 2))
+
+        self.simulation.refresh_torque(self.file_name)
+
+        self.assertEqual(self.reloaded, [True])
+        self.assertEqual(self.appended, [])
+        self.assertEqual(self.simulation.torque().num_time_steps, 50)
+
+    def test_replaced_file_is_reloaded_and_watched(self):
+        self.replace(120)
+        self.simulation.refresh_torque(self.file_name)
+
+        self.assertEqual(self.reloaded, [True])
+        self.assertEqual(self.simulation.torque().num_time_steps, 120)
+        self.assertIn(self.file_name, self.simulation.torque_watcher.files())
+
+    def test_unchanged_file_is_not_reloaded(self):
+        self.simulation.refresh_torque(self.file_name)
+
+        self.assertEqual(self.reloaded, [])
+        self.assertEqual(self.appended, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.torque_precision import MAX_RELATIVE_DRIFT, Params
+from computation.torque import TorqueFile
+from tests.torque_files import write_torque_file
+
+
+class TorquePrecisionTest(unittest.TestCase):
+    # mean Cp computed from float32 storage stays within MAX_RELATIVE_DRIFT of float64 storage
+
+    NUM_TIME_STEPS = 5000
+    PATCHES = (1, 2, 3, 4, 5)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        file_name = os.path.join(cls.directory.name, 'TORQUE.csv')
+        write_torque_file(file_name, cls.NUM_TIME_STEPS, cls.PATCHES)
+
+        cls.double = TorqueFile(file_name, params=Params(), use_cache=False, dtype=np.float64)
+        cls.double.read()
+        cls.single = TorqueFile(file_name, params=Params(), use_cache=False, dtype=np.float32)
+        cls.single.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def assertDriftWithinTolerance(self, actual, expected):
+        actual = np.asarray(actual, dtype=np.float64)
+        expected = np.asarray(expected, dtype=np.float64)
+        self.assertEqual(actual.shape, expected.shape)
+
+        drift = np.max(np.abs(actual - expected)) / np.max(np.abs(expected))
+        self.assertLessEqual(drift, MAX_RELATIVE_DRIFT)
+
+    def test_storage_precision(self):
+        self.assertEqual(self.single.torque.dtype, np.float32)
+        self.assertEqual(self.double.torque.dtype, np.float64)
+
+    def test_range_mean_cp(self):
+        end_rev = self.NUM_TIME_STEPS // Params.StepsPerRev
+        for start_rev in (1, end_rev // 2):
+            expected, time_steps = self.double.cp_mean_over_range(start_rev, end_rev, patches=self.PATCHES)
+            actual, time_steps = self.single.cp_mean_over_range(start_rev, end_rev, patches=self.PATCHES)
+            self.assertDriftWithinTolerance(actual, expected)
+
+    def test_sliding_window_cp(self):
+        n_revs_windows = (0.5, 1, 5)
+        expected = self.double.cp_mean_over_sliding_windows(n_revs_windows, patches=self.PATCHES)
+        actual = self.single.cp_mean_over_sliding_windows(n_revs_windows, patches=self.PATCHES)
+
+        for (actual_cp, actual_end), (expected_cp, expected_end) in zip(actual, expected):
+            np.testing.assert_array_equal(actual_end, expected_end)
+            self.assertDriftWithinTolerance(actual_cp, expected_cp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+import numpy as np
+
+
+def write_torque_file(file_name, num_time_steps, patches, steps_per_rev=100):
+    # torque with a positive mean, a once per revolution oscillation and noise, so that relative
+    # differences in mean Cp are meaningful
+    rng = np.random.RandomState(0)
+    time_steps = np.arange(num_time_steps)
+
+    with open(file_name, 'w') as file:
+        file.write('%d,%d\n' % (num_time_steps, len(patches)))
+        file.write('time,omega,patch,torque,Fx,Fy,Fz,Xx,Xy,Xz,area\n')
+
+        phase = 2 * np.pi * time_steps / steps_per_rev
+        for time_step in time_steps:
+            for patch in patches:
+                torque = 10.0 + patch + 3.0 * np.sin(phase[time_step] + patch) + rng.uniform(-0.5, 0.5)
+                file.write('%.8e,2.5,%d,%.8e,0,0,0,0,1,0,1\n' % (time_step * 1.0e-3, patch, torque))